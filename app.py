@@ -1,10 +1,42 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
-import joblib
+import os
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
 import base64
+import gzip
+import tempfile
+import hashlib
+import logging
+import sqlite3
+
+from src import warmup
+from src.history import HistoryIndex, PlayerHistoryCSR
+from src.squad_cube import SquadCube
+from src.datasource import check_db_path, open_source
+from src.partitions import discover_partitions
+from src.prediction_store import PredictionStore, lineup_rows
+from src.model_registry import ModelRegistry
+from src.streaming import score_chunks
+from src.similarity import ReplacementIndex
+from src.badges import badge_data_uris
+from src.render import (
+    CUSTOM_CSS, SQUAD_TABLE_COLUMNS, bench_html, formation_html, get_next_match,
+    team_badge_url, team_header_html, team_match_summary, team_name_variations
+)
+from src.pipeline import (
+    build_squad_features, calculate_temporal_features_from_history, compare_model_versions,
+    create_features, fit_imputer, get_available_features, get_feature_columns, predict_squads,
+    select_best_11_by_formation, squad_frame
+)
+from src.drift import DriftMonitor, monitored_features
+from src.explain import FEATURE_LABELS
+from src.fixtures import FixtureContextStore, next_fixture_context, attach_fixture_context
+
+logger = logging.getLogger(__name__)
 
 st.set_page_config(
     page_title="⚽ MatchLineup AI - Premier League",
@@ -13,34 +45,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Diccionario con URLs de escudos de equipos
-
-TEAM_BADGES = {
-    'Arsenal': 'https://upload.wikimedia.org/wikipedia/en/5/53/Arsenal_FC.svg',
-    'Manchester City': 'https://upload.wikimedia.org/wikipedia/en/e/eb/Manchester_City_FC_badge.svg',
-    'Aston Villa': 'https://resources.premierleague.com/premierleague25/badges-alt/7.svg',
-    'Manchester United': 'https://upload.wikimedia.org/wikipedia/en/7/7a/Manchester_United_FC_crest.svg',
-    'Chelsea': 'https://upload.wikimedia.org/wikipedia/en/c/cc/Chelsea_FC.svg',
-    'Liverpool': 'https://upload.wikimedia.org/wikipedia/en/0/0c/Liverpool_FC.svg',
-    'Brighton & Hove Albion': 'https://upload.wikimedia.org/wikipedia/en/f/fd/Brighton_%26_Hove_Albion_logo.svg',
-    'Newcastle United': 'https://upload.wikimedia.org/wikipedia/en/5/56/Newcastle_United_Logo.svg',
-    'Tottenham Hotspur': 'https://upload.wikimedia.org/wikipedia/en/b/b4/Tottenham_Hotspur.svg',
-    'Brentford': 'https://upload.wikimedia.org/wikipedia/en/2/2a/Brentford_FC_crest.svg',
-    'Everton': 'https://upload.wikimedia.org/wikipedia/en/7/7c/Everton_FC_logo.svg',
-    'Bournemouth': 'https://upload.wikimedia.org/wikipedia/en/e/e5/AFC_Bournemouth_%282013%29.svg',
-    'West Ham United': 'https://upload.wikimedia.org/wikipedia/en/c/c2/West_Ham_United_FC_logo.svg',
-    'Fulham': 'https://upload.wikimedia.org/wikipedia/en/e/eb/Fulham_FC_%28shield%29.svg',
-    'Crystal Palace': 'https://resources.premierleague.com/premierleague25/badges-alt/31.svg',
-    'Wolverhampton': 'https://upload.wikimedia.org/wikipedia/en/f/fc/Wolverhampton_Wanderers.svg',
-    'Nottingham Forest': 'https://upload.wikimedia.org/wikipedia/en/e/e5/Nottingham_Forest_F.C._logo.svg',
-    'Burnley': 'https://upload.wikimedia.org/wikipedia/en/6/6d/Burnley_FC_Logo.svg',
-    'Leeds United': 'https://upload.wikimedia.org/wikipedia/en/5/54/Leeds_United_F.C._logo.svg',
-    'Sunderland': 'https://upload.wikimedia.org/wikipedia/en/7/77/Logo_Sunderland.svg'
-}
+# Escudos generados con `python -m src.badges` (ver src/badges.py)
+BADGE_DIR = Path("static/badges")
+
+@st.cache_resource
+def get_badge_manifest():
+    """Escudos locales como data URI: se incrustan en el HTML, sin peticiones al renderizar"""
+    return badge_data_uris(BADGE_DIR)
 
-def get_team_badge(team_name):
-    """Obtiene la URL del escudo del equipo"""
-    return TEAM_BADGES.get(team_name, None)
+def get_team_badge(team_name, badges=None):
+    """Escudo del equipo: el de la partición o el local (static/badges)"""
+    return team_badge_url(team_name, badges, get_badge_manifest())
 
 def load_logo_as_base64(logo_path):
     """Carga el logo y lo convierte a base64 para embeber en HTML"""
@@ -79,924 +94,891 @@ def display_app_header():
 
     st.markdown(header_html, unsafe_allow_html=True)
 
-def display_team_header(team_name, next_match_info=None, show_formation=True):
+def display_team_header(team_name, next_match_info=None, show_formation=True, badges=None):
     """Muestra el header con escudo, nombre y próximo partido - TODO CENTRADO"""
-    badge_url = get_team_badge(team_name)
-
-    # HTML completo para centrar todo
-    header_html = '<div style="text-align: center; padding: 20px 0; margin-bottom: 20px;">'
-
-    # Escudo centrado
-    if badge_url:
-        header_html += f'<img src="{badge_url}" style="width: 100px; display: block; margin: 0 auto 15px auto;" />'
+    header_html = team_header_html(team_name, next_match_info, show_formation, get_team_badge(team_name, badges))
+    st.markdown(header_html, unsafe_allow_html=True)
 
-    # Nombre del equipo
-    header_html += f'<h1 style="color: white; margin: 10px 0 5px 0; font-size: 36px;">{team_name}</h1>'
+def load_custom_css():
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
-    # Formación (solo si show_formation=True)
-    if show_formation:
-        header_html += '<p style="color: #ffd700; font-size: 18px; font-weight: 600; margin: 5px 0;">Formación: 4-3-3</p>'
+def display_fixture_context(df_team):
+    """Muestra descanso, congestión y forma del rival del próximo partido"""
+    if len(df_team) == 0 or 'rest_days' not in df_team.columns:
+        return
 
-    # Próximo partido
-    if next_match_info:
-        if next_match_info['is_home']:
-            match_text = f"📅 Próximo: {next_match_info['date']} vs {next_match_info['opponent']} ({next_match_info['location']})"
-        else:
-            match_text = f"📅 Próximo: {next_match_info['date']} vs {next_match_info['opponent']} ({next_match_info['location']})"
+    context = df_team.iloc[0]
+    if pd.isna(context['opponent']):
+        return
 
-        header_html += f'<p style="color: white; background: rgba(0,0,0,0.3); padding: 8px 15px; border-radius: 8px; margin: 10px auto 0 auto; font-size: 14px; display: inline-block;">{match_text}</p>'
+    rest = f"{int(context['rest_days'])} días" if pd.notna(context['rest_days']) else "—"
+    context_text = (
+        f"😴 Descanso: {rest} • "
+        f"🗓️ Próx. 7 días: {int(context['matches_next_7d'])} • Próx. 14 días: {int(context['matches_next_14d'])} • "
+        f"📊 Rival (últ. 5): {int(context['opponent_form_points'])} pts, DG {int(context['opponent_form_gd']):+d}"
+    )
+    st.markdown(
+        f'<p style="text-align: center; color: #ccc; font-size: 13px; margin: -10px 0 20px 0;">{context_text}</p>',
+        unsafe_allow_html=True
+    )
 
-    header_html += '</div>'
+def display_formation_433(lineup, bench_players):
+    total_players = sum(len(lineup.get(pos, [])) for pos in ['G', 'D', 'M', 'F'])
 
-    st.markdown(header_html, unsafe_allow_html=True)
+    if total_players == 0:
+        st.warning("⚠️ No hay jugadores suficientes")
+        return
 
-def load_custom_css():
-    st.markdown("""
-    <style>
-    .football-field {
-        background: linear-gradient(180deg, #2d5016 0%, #1a3a0f 100%);
-        border: 3px solid #ffffff;
-        border-radius: 10px;
-        padding: 40px 20px;
-        position: relative;
-        min-height: 700px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        width: 100%;
-        max-width: 1400px;
-        margin: 0 auto;
-    }
-
-    .center-line {
-        position: absolute;
-        top: 50%;
-        left: 0;
-        width: 100%;
-        height: 2px;
-        background: white;
-        transform: translateY(-50%);
-        opacity: 0.3;
-    }
-
-    .center-circle {
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        width: 120px;
-        height: 120px;
-        border: 2px solid white;
-        border-radius: 50%;
-        transform: translate(-50%, -50%);
-        opacity: 0.3;
-    }
-
-    .lineup-row {
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        flex-wrap: wrap;
-        margin: 20px 0;
-        gap: 15px;
-        position: relative;
-        z-index: 10;
-        width: 100%;
-    }
-
-    .player-card {
-        background: rgba(255, 255, 255, 0.95);
-        border: 2px solid #1a3a0f;
-        border-radius: 10px;
-        padding: 12px 16px;
-        text-align: center;
-        width: 140px;
-        flex-shrink: 0;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.2);
-        transition: all 0.3s ease;
-    }
-
-    .player-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 12px rgba(0,0,0,0.3);
-    }
-
-    .player-number {
-        font-weight: 900;
-        font-size: 28px;
-        color: #1a3a0f;
-        margin-bottom: 6px;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-
-    .player-name {
-        font-weight: 600;
-        font-size: 11px;
-        color: #1a3a0f;
-        margin-bottom: 4px;
-        text-transform: uppercase;
-        letter-spacing: 0.3px;
-        word-wrap: break-word;
-        line-height: 1.2;
-    }
-
-    .player-position-badge {
-        font-size: 9px;
-        color: #666;
-        font-weight: 600;
-        background: rgba(0,0,0,0.05);
-        padding: 2px 6px;
-        border-radius: 4px;
-        display: inline-block;
-        margin-top: 3px;
-    }
-
-    .line-label {
-        text-align: center;
-        color: white;
-        font-weight: 700;
-        font-size: 15px;
-        margin: 15px 0 8px 0;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        width: 100%;
-    }
-
-    .goalkeeper .player-card {
-        background: rgba(255, 215, 0, 0.95);
-        border-color: #d4af37;
-    }
-
-    .bench-section {
-        margin-top: 30px;
-        padding: 20px;
-        background: rgba(255, 255, 255, 0.05);
-        border-radius: 10px;
-        max-width: 1400px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-
-    .bench-title {
-        color: white;
-        font-size: 20px;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 15px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-
-    .bench-player {
-        display: flex;
-        align-items: center;
-        padding: 10px 15px;
-        margin: 8px 0;
-        background: rgba(255, 255, 255, 0.9);
-        border-radius: 8px;
-        transition: all 0.2s ease;
-    }
-
-    .bench-player:hover {
-        background: rgba(255, 255, 255, 1);
-        transform: translateX(5px);
-    }
-
-    .bench-player-top5 {
-        background: linear-gradient(135deg, rgba(255, 215, 0, 0.3) 0%, rgba(255, 255, 255, 0.9) 100%);
-        border-left: 4px solid #ffd700;
-        font-weight: 600;
-    }
-
-    .bench-number {
-        font-size: 20px;
-        font-weight: 900;
-        color: #1a3a0f;
-        min-width: 40px;
-        text-align: center;
-    }
-
-    .bench-name {
-        flex-grow: 1;
-        font-size: 14px;
-        color: #1a3a0f;
-        margin-left: 15px;
-    }
-
-    .bench-position {
-        font-size: 12px;
-        color: #666;
-        font-weight: 600;
-        background: rgba(0,0,0,0.05);
-        padding: 4px 10px;
-        border-radius: 4px;
-        margin-right: 10px;
-    }
-
-    .bench-rank {
-        font-size: 11px;
-        color: #888;
-        min-width: 30px;
-        text-align: right;
-    }
-
-    .stat-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 20px;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-
-    .stat-number {
-        font-size: 32px;
-        font-weight: 900;
-        margin-bottom: 5px;
-    }
-
-    .stat-label {
-        font-size: 14px;
-        opacity: 0.9;
-    }
-
-    .match-card {
-        padding: 15px;
-        margin: 10px 0;
-        border-radius: 8px;
-        background: white;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        transition: all 0.2s ease;
-    }
-
-    .match-card:hover {
-        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-        transform: translateY(-2px);
-    }
-
-    .match-finished {
-        border-left: 4px solid #28a745;
-    }
-
-    .match-scheduled {
-        border-left: 4px solid #ffc107;
-    }
-
-    .match-postponed {
-        border-left: 4px solid #dc3545;
-    }
-
-    .match-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 10px;
-    }
-
-    .match-date {
-        font-size: 13px;
-        color: #666;
-        font-weight: 600;
-    }
-
-    .match-status {
-        font-size: 11px;
-        padding: 3px 8px;
-        border-radius: 4px;
-        font-weight: 600;
-    }
-
-    .status-finished {
-        background: #28a745;
-        color: white;
-    }
-
-    .status-scheduled {
-        background: #ffc107;
-        color: #000;
-    }
-
-    .status-postponed {
-        background: #dc3545;
-        color: white;
-    }
-
-    .match-teams {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 10px 0;
-    }
-
-    .team-home, .team-away {
-        flex: 1;
-        font-size: 15px;
-        font-weight: 600;
-        color: #1a3a0f;
-    }
-
-    .team-away {
-        text-align: right;
-    }
-
-    .match-score {
-        font-size: 24px;
-        font-weight: 900;
-        color: #1a3a0f;
-        min-width: 80px;
-        text-align: center;
-    }
-
-    .match-vs {
-        font-size: 16px;
-        color: #999;
-        font-weight: 600;
-        min-width: 80px;
-        text-align: center;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-def calculate_temporal_features_from_history(df_historico):
-    """
-    Calcula SOLO player_last_3_avg desde el histórico
-    """
-    df_hist = df_historico.copy()
-    df_hist['minutesPlayed'] = df_hist['minutesPlayed'].fillna(0)
+    st.markdown(formation_html(lineup), unsafe_allow_html=True)
 
-    # Calcular promedio móvil de los últimos 3 partidos
-    df_hist['player_last_3_avg_temp'] = df_hist.groupby('id_player')['minutesPlayed'].transform(
-        lambda x: x.rolling(3, min_periods=1).mean()
+    # BANCA
+    if bench_players and len(bench_players) > 0:
+        st.markdown(bench_html(bench_players), unsafe_allow_html=True)
+
+SQUAD_TABLE_CONFIG = {
+    'player_name': st.column_config.TextColumn('Jugador'),
+    'team': st.column_config.TextColumn('Equipo'),
+    'position_label': st.column_config.TextColumn('Pos'),
+    'age': st.column_config.NumberColumn('Edad'),
+    'matchs': st.column_config.NumberColumn('PJ'),
+    'minutes_played': st.column_config.NumberColumn('Min'),
+    'minutes_per_match': st.column_config.NumberColumn('Min/PJ', format='%.0f'),
+    'goals': st.column_config.NumberColumn('Goles'),
+    'goals_per_match': st.column_config.NumberColumn('G/PJ', format='%.2f'),
+    'assits': st.column_config.NumberColumn('Asist'),
+    'assists_per_match': st.column_config.NumberColumn('A/PJ', format='%.2f'),
+    'goal_contributions_per_90': st.column_config.NumberColumn('G+A/90', format='%.2f'),
+    'goal_contributions_per_90_pct_position': st.column_config.ProgressColumn(
+        'Pctl Pos', format='%.0f', min_value=0, max_value=100
     )
+}
 
-    # Obtener el último valor por jugador
-    features_temporales = df_hist.groupby('id_player').agg({
-        'player_last_3_avg_temp': 'last'
-    }).reset_index()
-
-    features_temporales.rename(columns={
-        'id_player': 'id_player',
-        'player_last_3_avg_temp': 'player_last_3_avg'
-    }, inplace=True)
-
-    return features_temporales
-
-def create_features(df):
-    df = df.copy()
-    
-    required = {
-        'market_value': 0, 'age': 25, 'captain': 0,
-        'player_last_3_avg': 45.0, 'country_': 'Unknown',
-        'position': 'M', 'team': 'Unknown'
-    }
-    for col, default in required.items():
-        if col not in df.columns:
-            df[col] = default
-        df[col] = df[col].fillna(default)
-    
-    df['market_value_log'] = np.log1p(df['market_value'])
-    
-    peak_age = 26
-    df['value_age_decay'] = df['market_value'] * np.exp(-0.05 * np.abs(df['age'] - peak_age))
-    
-    df['captain_x_market'] = df['captain'] * df['market_value_log']
-    
-    position_rank = {'G': 1, 'D': 2, 'M': 3, 'F': 4}
-    df['position_rank'] = df['position'].map(position_rank).fillna(3)
-    df['position_x_age'] = df['position_rank'] * df['age']
-    
-    df['player_convocations'] = np.maximum(df['age'] - 16, 0)
-    
-    team_avg = df.groupby('team')['market_value'].transform('mean')
-    df['team_avg_market_value'] = team_avg
-    df['player_value_vs_team'] = df['market_value'] / (team_avg + 1)
-    
-    df['pos_D'] = (df['position'] == 'D').astype(int)
-    df['pos_F'] = (df['position'] == 'F').astype(int)
-    df['pos_G'] = (df['position'] == 'G').astype(int)
-    df['pos_M'] = (df['position'] == 'M').astype(int)
-    
-    country_freq = df['country_'].value_counts(normalize=True)
-    df['country_frequency'] = df['country_'].map(country_freq).fillna(0.01)
-    
-    team_freq = df['team'].value_counts(normalize=True)
-    df['team_frequency'] = df['team'].map(team_freq).fillna(0.05)
-    
-    df['age_group'] = pd.cut(
-        df['age'], bins=[0, 21, 25, 29, 33, 50], labels=[0, 1, 2, 3, 4]
-    )
-    df['age_group_encoded'] = df['age_group'].fillna(1).astype(int)
-    
-    df['market_tier'] = pd.cut(
-        df['market_value'], bins=[0, 1e6, 5e6, 15e6, 30e6, np.inf], labels=[0, 1, 2, 3, 4]
+def display_leaderboard(leaderboard, columns):
+    """Muestra una clasificación precalculada del cubo de plantillas"""
+    st.dataframe(
+        leaderboard[['player_name'] + columns],
+        column_config=SQUAD_TABLE_CONFIG,
+        hide_index=True, use_container_width=True
     )
-    df['market_tier_encoded'] = df['market_tier'].fillna(1).astype(int)
-    
-    df = df.replace([np.inf, -np.inf], 0)
-    df = df.fillna(0)
-    
-    return df
-
-
-def get_feature_columns():
-    return [
-        'market_value_log',
-        'value_age_decay',
-        'captain_x_market',
-        'position_x_age',
-        'player_convocations',
-        'player_last_3_avg',
-        'team_avg_market_value',
-        'player_value_vs_team',
-        'pos_D',
-        'pos_F',
-        'pos_G',
-        'pos_M',
-        'country_frequency',
-        'team_frequency',
-        'age_group_encoded',
-        'market_tier_encoded'
-    ]
-
-
-def select_best_11_by_formation(df, model, scaler, team):
-    team_df = df[df['team'] == team].copy()
 
-    if len(team_df) == 0:
-        return None, None
+STARTER_MINUTES = 60
 
-    team_df = create_features(team_df)
-    feature_cols = get_feature_columns()
-    X = team_df[feature_cols]
-    X_scaled = scaler.transform(X)
+def display_player_drilldown(player_history, df, team_name, prediction_store=None):
+    """Muestra minutos, media móvil y titularidades de un jugador del equipo"""
+    team_df = df[df['team'] == team_name].sort_values(['position', 'shirt_number'])
 
-    probabilities = model.predict_proba(X_scaled)[:, 1]
-    team_df['probability'] = probabilities
+    if len(team_df) == 0:
+        st.warning(f"⚠️ No hay jugadores para {team_name}")
+        return
 
-    formation = {'G': 1, 'D': 4, 'M': 3, 'F': 3}
-    lineup = {}
-    starters_ids = []
+    names = dict(zip(team_df['id_player'], team_df['player_name']))
+    selected_player = st.selectbox(
+        "Jugador:", list(names), format_func=lambda x: names[x], key="drilldown_player"
+    )
 
-    for position, num_players in formation.items():
-        position_players = team_df[team_df['position'] == position].copy()
+    history = player_history.player(selected_player)
 
-        if len(position_players) == 0:
-            lineup[position] = []
-            continue
+    if history is None or len(history['minutesPlayed']) == 0:
+        st.info(f"ℹ️ {names[selected_player]} no tiene partidos en el histórico")
+        return
 
-        position_players = position_players.sort_values('probability', ascending=False)
-        best_players = position_players.head(num_players)
-        best_players['rank'] = range(1, len(best_players) + 1)
-
-        starters_ids.extend(best_players['id_player'].tolist())
-
-        lineup[position] = best_players[[
-            'id_player', 'position', 'player_name', 'shirt_number',
-            'probability', 'captain'
-        ]].to_dict('records')
-
-    bench_df = team_df[~team_df['id_player'].isin(starters_ids)].copy()
-    bench_df = bench_df.sort_values('probability', ascending=False)
-    bench_df['bench_rank'] = range(1, len(bench_df) + 1)
-
-    bench_players = bench_df[[
-        'id_player', 'player_name', 'shirt_number', 'position', 
-        'probability', 'bench_rank'
-    ]].to_dict('records')
-
-    return lineup, bench_players
-
-def normalize_team_name(name):
-    """Normaliza los nombres de equipos para coincidir entre datasets"""
-    name_mapping = {
-        'Arsenal FC': 'Arsenal',
-        'Aston Villa FC': 'Aston Villa',
-        'AFC Bournemouth': 'Bournemouth',
-        'Brentford FC': 'Brentford',
-        'Brighton & Hove Albion FC': 'Brighton',
-        'Burnley FC': 'Burnley',
-        'Chelsea FC': 'Chelsea',
-        'Crystal Palace FC': 'Crystal Palace',
-        'Everton FC': 'Everton',
-        'Fulham FC': 'Fulham',
-        'Leeds United FC': 'Leeds United',
-        'Liverpool FC': 'Liverpool',
-        'Manchester City FC': 'Manchester City',
-        'Manchester United FC': 'Manchester Utd',
-        'Newcastle United FC': 'Newcastle United',
-        'Nottingham Forest FC': 'Nottingham Forest',
-        'Sunderland AFC': 'Sunderland',
-        'Tottenham Hotspur FC': 'Tottenham Hotspur',
-        'West Ham United FC': 'West Ham United',
-        'Wolverhampton Wanderers FC': 'Wolves'
-    }
-    return name_mapping.get(name, name)
-
-def get_next_match(df_matches, team_name):
-    """Obtiene el próximo partido del equipo"""
-    if df_matches is None or len(df_matches) == 0:
-        return None
+    minutes = np.asarray(history['minutesPlayed'])
+    rolling_avg = pd.Series(minutes).rolling(3, min_periods=1).mean().to_numpy()
+    starts = int((minutes >= STARTER_MINUTES).sum())
 
-    team_variations = [team_name]
-    if team_name == 'Arsenal':
-        team_variations.append('Arsenal FC')
-    elif team_name == 'Manchester Utd':
-        team_variations.append('Manchester United FC')
-    elif team_name == 'Wolves':
-        team_variations.append('Wolverhampton Wanderers FC')
+    col1, col2, col3, col4 = st.columns(4)
 
-    team_matches = df_matches[
-        (df_matches['home_team_name'].isin(team_variations)) | 
-        (df_matches['away_team_name'].isin(team_variations))
-    ].copy()
+    with col1:
+        st.markdown(f'<div class="stat-card"><div class="stat-number">{len(minutes)}</div><div class="stat-label">Partidos</div></div>', unsafe_allow_html=True)
 
-    if len(team_matches) == 0:
-        return None
+    with col2:
+        st.markdown(f'<div class="stat-card"><div class="stat-number">{starts}</div><div class="stat-label">Titularidades</div></div>', unsafe_allow_html=True)
 
-    team_matches['utcDate'] = pd.to_datetime(team_matches['utcDate'])
+    with col3:
+        st.markdown(f'<div class="stat-card"><div class="stat-number">{minutes.mean():.0f}</div><div class="stat-label">Min/PJ</div></div>', unsafe_allow_html=True)
 
-    scheduled = team_matches[team_matches['status'].isin(['TIMED', 'POSTPONED'])].copy()
+    with col4:
+        st.markdown(f'<div class="stat-card"><div class="stat-number">{rolling_avg[-1]:.0f}</div><div class="stat-label">Media Últimos 3</div></div>', unsafe_allow_html=True)
 
-    if len(scheduled) == 0:
-        return None
+    dates = np.asarray(history['date'])
+    if (dates != np.iinfo(np.int64).min).all():
+        index = pd.to_datetime(dates)
+    else:
+        # Esquema sin fechas: eje por número de partido
+        index = pd.RangeIndex(1, len(minutes) + 1, name='Partido')
+
+    chart_df = pd.DataFrame({'Minutos': minutes, 'Media móvil (3)': rolling_avg}, index=index)
+    st.line_chart(chart_df)
+
+    if prediction_store is not None:
+        trend = prediction_store.player_trend(selected_player)
+        if len(trend) > 0:
+            st.markdown("#### 🎯 Probabilidad de Titularidad por Ejecución")
+            trend_chart = trend.assign(run_date=pd.to_datetime(trend['run_date'])).pivot_table(
+                index='run_date', columns='model_version', values='probability', aggfunc='last'
+            )
+            st.line_chart(trend_chart)
+
+def display_prediction_accuracy(prediction_store, history_index, team_name):
+    """Compara el XI previsto con los titulares reales (requiere histórico por partido)"""
+    if prediction_store is None or not history_index.has_dates:
+        return
 
-    scheduled = scheduled.sort_values('utcDate')
-    next_match = scheduled.iloc[0]
+    results = []
+    for match_id in prediction_store.predicted_matches(team_name)['match_id']:
+        played = history_index.match_lineup(match_id, team_name)
+        if len(played) == 0:
+            continue
+        starters = played.loc[played['minutesPlayed'] >= STARTER_MINUTES, 'id_player']
+        comparison = prediction_store.compare_with_actual(match_id, team_name, starters, played['date'].iloc[0])
+        results.append({
+            'Partido': match_id,
+            'Fecha': played['date'].iloc[0],
+            'Aciertos': f"{comparison['hits']}/{comparison['predicted']}"
+        })
+
+    if results:
+        st.markdown("### 🔍 Predicción vs Realidad")
+        st.dataframe(pd.DataFrame(results), hide_index=True, use_container_width=True)
+
+REPLACEMENT_COUNT = 3
+
+def display_replacements(replacement_index, lineup, team_name):
+    """Alternativas más parecidas a un titular, del propio equipo o de toda la liga"""
+    starters = [player for players in lineup.values() for player in players]
+    starters = [player for player in starters if player['id_player'] in replacement_index]
+    if not starters:
+        return
 
-    is_home = next_match['home_team_name'] in team_variations
-    opponent = next_match['away_team_name'] if is_home else next_match['home_team_name']
-    opponent = normalize_team_name(opponent)
+    st.markdown("### 🔄 Reemplazos")
 
-    location = 'Local' if is_home else 'Visitante'
-    date_str = next_match['utcDate'].strftime('%d/%m/%Y')
+    labels = {player['id_player']: f"{player['player_name']} ({player['position']})" for player in starters}
+    starter_ids = list(labels)
 
-    return {
-        'opponent': opponent,
-        'location': location,
-        'date': date_str,
-        'is_home': is_home
-    }
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        # Opciones por id: el valor elegido sobrevive a los reruns aunque cambie la probabilidad
+        starter_id = st.selectbox(
+            "Si no puede jugar:", starter_ids, format_func=labels.get, key="replacement_for"
+        )
+    with col2:
+        scope = st.radio("Buscar en:", ["Equipo", "Liga"], horizontal=True, key="replacement_scope")
 
-def display_formation_433(lineup, bench_players):
-    total_players = sum(len(lineup.get(pos, [])) for pos in ['G', 'D', 'M', 'F'])
+    if scope == "Equipo":
+        candidates = replacement_index.replacements(
+            starter_id, REPLACEMENT_COUNT, team=team_name, exclude=starter_ids
+        )
+    else:
+        candidates = replacement_index.replacements(starter_id, REPLACEMENT_COUNT, exclude=starter_ids)
 
-    if total_players == 0:
-        st.warning("⚠️ No hay jugadores suficientes")
+    if len(candidates) == 0:
+        st.info("No hay jugadores parecidos disponibles en esa posición")
         return
 
-    field_html = '<div class="football-field">'
-    field_html += '<div class="center-line"></div>'
-    field_html += '<div class="center-circle"></div>'
-
-    # DELANTEROS
-    field_html += '<div class="line-label">⚡ DELANTEROS</div>'
-    forwards = lineup.get('F', [])
-    if forwards:
-        field_html += '<div class="lineup-row">'
-        for player in forwards:
-            name = player.get('player_name', f"Jugador {player['id_player']}")
-            number = player.get('shirt_number', '?')
-            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">DEL</div></div>'
-        field_html += '</div>'
-
-    # MEDIOCAMPISTAS
-    field_html += '<div class="line-label">⚙️ MEDIOCAMPISTAS</div>'
-    midfielders = lineup.get('M', [])
-    if midfielders:
-        field_html += '<div class="lineup-row">'
-        for player in midfielders:
-            name = player.get('player_name', f"Jugador {player['id_player']}")
-            number = player.get('shirt_number', '?')
-            captain = ' (C)' if player.get('captain', 0) == 1 else ''
-            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}{captain}</div><div class="player-position-badge">MED</div></div>'
-        field_html += '</div>'
-
-    # DEFENSAS
-    field_html += '<div class="line-label">🛡️ DEFENSAS</div>'
-    defenders = lineup.get('D', [])
-    if defenders:
-        field_html += '<div class="lineup-row">'
-        for player in defenders:
-            name = player.get('player_name', f"Jugador {player['id_player']}")
-            number = player.get('shirt_number', '?')
-            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">DEF</div></div>'
-        field_html += '</div>'
-
-    # PORTERO
-    field_html += '<div class="line-label">🧤 PORTERO</div>'
-    goalkeeper = lineup.get('G', [])
-    if goalkeeper:
-        gk = goalkeeper[0]
-        name = gk.get('player_name', f"Jugador {gk['id_player']}")
-        number = gk.get('shirt_number', '?')
-        field_html += '<div class="lineup-row goalkeeper">'
-        field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">POR</div></div>'
-        field_html += '</div>'
-
-    field_html += '</div>'
-    st.markdown(field_html, unsafe_allow_html=True)
+    st.dataframe(
+        candidates[['player_name', 'team', 'position', 'probability', 'distance']],
+        column_config={
+            'player_name': st.column_config.TextColumn('Jugador'),
+            'team': st.column_config.TextColumn('Equipo'),
+            'position': st.column_config.TextColumn('Pos'),
+            'probability': st.column_config.ProgressColumn('Prob.', format='%.2f', min_value=0, max_value=1),
+            'distance': st.column_config.NumberColumn('Distancia', format='%.2f')
+        },
+        hide_index=True, use_container_width=True
+    )
 
-    # BANCA
-    if bench_players and len(bench_players) > 0:
-        bench_html = '<div class="bench-section">'
-        bench_html += '<div class="bench-title">JUGADORES EN BANCA</div>'
+def display_model_comparison(comparison, team_name, version_a, version_b):
+    """Probabilidades de dos versiones del modelo para la plantilla del equipo"""
+    team_comparison = comparison[comparison['team'] == team_name].copy()
+    team_comparison['delta'] = team_comparison[version_b] - team_comparison[version_a]
+    team_comparison = team_comparison.sort_values(version_a, ascending=False)
+
+    st.markdown(f"### ⚖️ Comparación de Modelos: {version_a} vs {version_b}")
+    st.dataframe(
+        team_comparison[['player_name', 'position', version_a, version_b, 'delta']],
+        column_config={
+            'player_name': st.column_config.TextColumn('Jugador'),
+            'position': st.column_config.TextColumn('Pos'),
+            version_a: st.column_config.NumberColumn(version_a, format='%.2f'),
+            version_b: st.column_config.NumberColumn(version_b, format='%.2f'),
+            'delta': st.column_config.NumberColumn('Δ', format='%+.2f')
+        },
+        hide_index=True, use_container_width=True
+    )
 
-        for player in bench_players:
-            number = player.get('shirt_number', '?')
-            name = player.get('player_name', f"Jugador {player['id_player']}")
-            position = player.get('position', '?')
-            rank = player.get('bench_rank', 0)
+UPLOAD_PREVIEW_ROWS = 20
+UPLOAD_OUTPUT_COLUMNS = ['id_player', 'player_name', 'team', 'position', 'age', 'market_value', 'probability']
+UPLOAD_PREFIX = 'rotation_'
+# Resultados de sesiones que ya no existen: se borran al puntuar un archivo nuevo
+UPLOAD_MAX_AGE_SECONDS = 6 * 3600
+
+def upload_featurizer(last_3_avg, imputer):
+    """Features de un bloque subido; completa player_last_3_avg desde el histórico si falta"""
+    def featurize(chunk, batch_stats):
+        if 'player_last_3_avg' not in chunk.columns:
+            chunk = chunk.merge(last_3_avg, on='id_player', how='left')
+        return create_features(imputer.transform(chunk), batch_stats)
+
+    return featurize
+
+def remove_stale_uploads(max_age=UPLOAD_MAX_AGE_SECONDS):
+    """Borra los resultados temporales de puntuaciones más antiguos que `max_age` segundos"""
+    cutoff = datetime.now().timestamp() - max_age
+    for path in Path(tempfile.gettempdir()).glob(f'{UPLOAD_PREFIX}*.csv.gz'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            # Otro worker lo borró antes
+            pass
+
+def display_upload_scoring(data_dir, data_version, model_version):
+    """Puntúa un CSV subido por bloques, mostrando el progreso y los mejores jugadores"""
+    uploaded = st.file_uploader(
+        "CSV con el formato de convocatoria_siguiente.csv (id_player, team, position, age, market_value...)",
+        type='csv', key='upload_file'
+    )
 
-            css_class = 'bench-player bench-player-top5' if rank <= 5 else 'bench-player'
+    if uploaded is not None and st.button("▶️ Calcular probabilidades", key='upload_score'):
+        model, scaler, spec = get_model_registry().get(model_version)
+        imputer = load_imputer(data_dir, data_version)
+        featurize = upload_featurizer(calculate_temporal_features_from_history(load_history_index(data_dir, data_version)), imputer)
+
+        previous = st.session_state.pop('upload_result', None)
+        if previous is not None:
+            Path(previous['path']).unlink(missing_ok=True)
+        remove_stale_uploads()
+
+        progress = st.progress(0.0, text="Calculando...")
+        preview = st.empty()
+        top = None
+        rows = 0
+        issues = 0
+
+        # Salida comprimida en disco: la memoria no crece con el tamaño del archivo
+        output = tempfile.NamedTemporaryFile(prefix=UPLOAD_PREFIX, suffix='.csv.gz', delete=False)
+        try:
+            with output, gzip.open(output, 'wt', newline='') as out:
+                chunks = score_chunks(
+                    uploaded, featurize, model, scaler, spec.features or get_feature_columns(),
+                    stats_transform=lambda chunk: imputer.transform(chunk, ['market_value'])
+                )
+                for i, (scored, report) in enumerate(chunks):
+                    columns = [col for col in UPLOAD_OUTPUT_COLUMNS if col in scored.columns]
+                    scored[columns].to_csv(out, header=(i == 0), index=False)
+
+                    rows += len(scored)
+                    issues += len(report)
+                    best = scored[columns].nlargest(UPLOAD_PREVIEW_ROWS, 'probability')
+                    top = best if top is None else pd.concat([top, best]).nlargest(UPLOAD_PREVIEW_ROWS, 'probability')
+
+                    progress.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0), text=f"{rows:,} jugadores")
+                    preview.dataframe(top, hide_index=True, use_container_width=True)
+        except BaseException as exc:
+            # También si la sesión se corta o se relanza a mitad: no quedan archivos huérfanos
+            Path(output.name).unlink(missing_ok=True)
+            progress.empty()
+            preview.empty()
+            # Errores de lectura/validación del CSV (EmptyDataError, ParserError, columnas, codificación)
+            if not isinstance(exc, ValueError):
+                raise
+            st.error(f"❌ No se pudo puntuar {uploaded.name}: {exc}")
+            return
+
+        progress.empty()
+        preview.empty()
+        st.session_state['upload_result'] = {
+            'name': Path(uploaded.name).stem,
+            'path': output.name,
+            'rows': rows,
+            'issues': issues,
+            'top': top
+        }
+
+    result = st.session_state.get('upload_result')
+    if result is None or not Path(result['path']).exists():
+        return
 
-            pos_labels = {'G': 'POR', 'D': 'DEF', 'M': 'MED', 'F': 'DEL'}
-            pos_label = pos_labels.get(position, position)
+    st.success(f"✅ {result['rows']:,} jugadores puntuados con el modelo {model_version}")
+    if result['issues']:
+        st.caption(f"⚠️ {result['issues']:,} incidencias de validación (filas sin id_player o team descartadas)")
 
-            bench_html += f'<div class="{css_class}"><div class="bench-number">{number}</div><div class="bench-name">{name}</div><div class="bench-position">{pos_label}</div><div class="bench-rank">#{rank}</div></div>'
+    st.markdown(f"#### 🔝 {UPLOAD_PREVIEW_ROWS} jugadores con mayor probabilidad")
+    st.dataframe(result['top'], hide_index=True, use_container_width=True)
 
-        bench_html += '</div>'
-        st.markdown(bench_html, unsafe_allow_html=True)
+    with open(result['path'], 'rb') as f:
+        st.download_button(
+            "⬇️ Descargar resultados (.csv.gz)", f,
+            file_name=f"{result['name']}_probabilidades.csv.gz", mime='application/gzip'
+        )
 
-def display_team_matches(df_matches, team_name):
+def display_team_matches(df_matches, team_name, aliases=None):
     """Muestra los partidos de un equipo específico"""
+    summary = team_match_summary(df_matches, team_name, aliases)
 
-    team_variations = [team_name]
-    if team_name == 'Arsenal':
-        team_variations.append('Arsenal FC')
-    elif team_name == 'Manchester Utd':
-        team_variations.append('Manchester United FC')
-    elif team_name == 'Wolves':
-        team_variations.append('Wolverhampton Wanderers FC')
-
-    team_matches = df_matches[
-        df_matches['home_team_name'].isin(team_variations) | 
-        df_matches['away_team_name'].isin(team_variations)
-    ].copy()
-
-    if len(team_matches) == 0:
+    if summary is None:
         st.warning(f"⚠️ No se encontraron partidos para {team_name}")
         return
 
-    team_matches['utcDate'] = pd.to_datetime(team_matches['utcDate'])
-    team_matches = team_matches.sort_values('utcDate')
+    for col, card_html in zip(st.columns(6), summary['record']):
+        with col:
+            st.markdown(card_html, unsafe_allow_html=True)
 
-    finished = team_matches[team_matches['status'] == 'FINISHED'].copy()
-    scheduled = team_matches[team_matches['status'].isin(['TIMED', 'POSTPONED'])].copy()
+    st.markdown("---")
 
-    wins = 0
-    draws = 0
-    losses = 0
-    goals_for = 0
-    goals_against = 0
+    col_past, col_next = st.columns(2)
 
-    for _, match in finished.iterrows():
-        is_home = match['home_team_name'] in team_variations
-        team_score = match['score_home'] if is_home else match['score_away']
-        opp_score = match['score_away'] if is_home else match['score_home']
+    with col_past:
+        st.markdown("### 📊 Últimos Partidos")
+
+        for match_html in summary['results']:
+            st.markdown(match_html, unsafe_allow_html=True)
 
-        goals_for += team_score
-        goals_against += opp_score
+    with col_next:
+        st.markdown("### 📅 Próximos Partidos")
 
-        if team_score > opp_score:
-            wins += 1
-        elif team_score == opp_score:
-            draws += 1
+        if len(summary['fixtures']) == 0:
+            st.info("✅ No hay más partidos programados")
         else:
-            losses += 1
+            for match_html in summary['fixtures']:
+                st.markdown(match_html, unsafe_allow_html=True)
 
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
+DATA_DIR = Path("data")
+DATA_TABLES = ['convocatoria_siguiente', 'historico', 'jugadores_info', 'plantilla', 'premier_matches']
 
-    with col1:
-        st.markdown(f'<div class="stat-card"><div class="stat-number">{len(finished)}</div><div class="stat-label">Jugados</div></div>', unsafe_allow_html=True)
+# Particiones (competición/temporada) que pueden estar cargadas a la vez en un worker.
+# Las cachés por partición son LRU: al abrir una nueva se descarta la menos usada.
+MAX_LOADED_PARTITIONS = 3
+# Entradas filtradas por equipo (hasta ~30 equipos por partición)
+MAX_TEAM_ENTRIES = MAX_LOADED_PARTITIONS * 30
 
-    with col2:
-        st.markdown(f'<div class="stat-card" style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%);"><div class="stat-number">{wins}</div><div class="stat-label">Ganados</div></div>', unsafe_allow_html=True)
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def get_data_source(data_dir):
+    """Backend de datos de una partición, compartido por todas las sesiones (ver src/datasource.py)"""
+    return open_source(data_dir=data_dir)
 
-    with col3:
-        st.markdown(f'<div class="stat-card" style="background: linear-gradient(135deg, #ffc107 0%, #ffb300 100%);"><div class="stat-number">{draws}</div><div class="stat-label">Empates</div></div>', unsafe_allow_html=True)
+@st.cache_data(max_entries=MAX_TEAM_ENTRIES)
+def read_table(data_dir, data_version, table, team=None):
+    """
+    Lee una tabla normalizada/validada (src/schema.py), opcionalmente solo de un
+    equipo (`team`: nombre o tupla con sus variantes). `data_version`
+    (data_fingerprint) forma parte de la clave de caché de esta función y de
+    todos los loaders que la usan: al cambiar los archivos se releen.
+    """
+    return get_data_source(data_dir).read(table, team)
 
-    with col4:
-        st.markdown(f'<div class="stat-card" style="background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);"><div class="stat-number">{losses}</div><div class="stat-label">Perdidos</div></div>', unsafe_allow_html=True)
+def require_table(data_dir, table):
+    """Detiene la app si falta una tabla imprescindible"""
+    source = get_data_source(data_dir)
+    if not source.exists(table):
+        st.error(f"❌ No se encontró: {source.path(table)}")
+        st.stop()
 
-    with col5:
-        st.markdown(f'<div class="stat-card" style="background: linear-gradient(135deg, #17a2b8 0%, #138496 100%);"><div class="stat-number">{int(goals_for)}</div><div class="stat-label">GF</div></div>', unsafe_allow_html=True)
+def display_data_quality(data_dir, data_version):
+    """Resumen en la barra lateral de las filas con problemas en los datos"""
+    source = get_data_source(data_dir)
+    reports = [read_table(data_dir, data_version, table)[1] for table in DATA_TABLES if source.exists(table)]
+    report = pd.concat(reports, ignore_index=True)
 
-    with col6:
-        st.markdown(f'<div class="stat-card" style="background: linear-gradient(135deg, #6c757d 0%, #5a6268 100%);"><div class="stat-number">{int(goals_against)}</div><div class="stat-label">GC</div></div>', unsafe_allow_html=True)
+    if len(report) == 0:
+        return
 
-    st.markdown("---")
+    errors = int((report['severity'] == 'error').sum())
+    label = f"🧪 Calidad de datos: {len(report)} incidencias ({errors} filas descartadas)"
+    with st.expander(label, expanded=False):
+        summary = report.groupby(['file', 'column', 'issue']).size().rename('filas').reset_index()
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+        st.dataframe(report, hide_index=True, use_container_width=True, height=250)
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def load_history_index(data_dir, data_version):
+    """Histórico ordenado e indexado una sola vez por partición"""
+    require_table(data_dir, 'historico')
+
+    df_historico, _ = read_table(data_dir, data_version, 'historico')
+    return HistoryIndex(df_historico, load_matches(data_dir, data_version))
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def load_player_history(data_dir, data_version):
+    """Índice CSR por jugador (memory-map); se reconstruye si cambia el histórico o los partidos"""
+    require_table(data_dir, 'historico')
+
+    cache_dir = Path(data_dir) / "cache" / "player_history"
+    # Las fechas del histórico por partido salen de premier_matches: también forman parte de la clave
+    data_source = get_data_source(data_dir)
+    source = {}
+    for table in ('historico', 'premier_matches'):
+        if data_source.exists(table):
+            stat = data_source.path(table).stat()
+            source[table] = {'size': stat.st_size, 'mtime': stat.st_mtime}
 
-    col_past, col_next = st.columns(2)
+    try:
+        player_history = PlayerHistoryCSR.load(cache_dir)
+        if player_history.meta.get('source') == source:
+            return player_history
+    except (OSError, ValueError):
+        pass
 
-    with col_past:
-        st.markdown("### 📊 Últimos Partidos")
+    player_history = PlayerHistoryCSR.from_index(load_history_index(data_dir, data_version), meta={'source': source})
+    try:
+        player_history.save(cache_dir)
+    except OSError:
+        # Sistema de archivos de solo lectura: se usa el índice en memoria
+        pass
+    return player_history
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def load_imputer(data_dir, data_version):
+    """Medianas por equipo/posición/nivel de mercado, ajustadas sobre el último estado de cada jugador"""
+    return fit_imputer(load_history_index(data_dir, data_version))
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS)
+def load_data(data_dir, data_version):
+    require_table(data_dir, 'convocatoria_siguiente')
+
+    df_convocatoria, _ = read_table(data_dir, data_version, 'convocatoria_siguiente')
+    source = get_data_source(data_dir)
+
+    df_jugadores = None
+    if source.exists('jugadores_info'):
+        df_jugadores, _ = read_table(data_dir, data_version, 'jugadores_info')
+    else:
+        st.warning(f"⚠️ No se encontró {source.path('jugadores_info')}")
 
-        last_matches = finished.tail(10).iloc[::-1]
-
-        for _, match in last_matches.iterrows():
-            is_home = match['home_team_name'] in team_variations
-            team_score = int(match['score_home']) if is_home else int(match['score_away'])
-            opp_score = int(match['score_away']) if is_home else int(match['score_home'])
-            opponent = match['away_team_name'] if is_home else match['home_team_name']
-            opponent = normalize_team_name(opponent)
-
-            date_str = match['utcDate'].strftime('%d/%m/%Y')
-            location = 'Local' if is_home else 'Visitante'
-
-            if team_score > opp_score:
-                match_class = 'match-finished'
-                status_class = 'status-finished'
-                status_text = 'VICTORIA'
-            elif team_score == opp_score:
-                match_class = 'match-finished'
-                status_class = 'status-scheduled'
-                status_text = 'EMPATE'
-            else:
-                match_class = 'match-finished'
-                status_class = 'status-postponed'
-                status_text = 'DERROTA'
-
-            match_html = f'''
-            <div class="match-card {match_class}">
-                <div class="match-header">
-                    <div class="match-date">📅 {date_str} • {location}</div>
-                    <div class="match-status {status_class}">{status_text}</div>
-                </div>
-                <div class="match-teams">
-                    <div class="team-home">{team_name if is_home else opponent}</div>
-                    <div class="match-score">{team_score} - {opp_score}</div>
-                    <div class="team-away">{opponent if is_home else team_name}</div>
-                </div>
-            </div>
-            '''
-            st.markdown(match_html, unsafe_allow_html=True)
+    return squad_frame(
+        df_convocatoria, load_history_index(data_dir, data_version), load_imputer(data_dir, data_version), df_jugadores
+    )
 
-    with col_next:
-        st.markdown("### 📅 Próximos Partidos")
+@st.cache_data(max_entries=MAX_TEAM_ENTRIES)
+def load_plantilla(data_dir, data_version, team=None):
+    source = get_data_source(data_dir)
 
-        next_matches = scheduled.head(10)
+    if not source.exists('plantilla'):
+        st.error(f"❌ No se encontró: {source.path('plantilla')}")
+        return None
 
-        if len(next_matches) == 0:
-            st.info("✅ No hay más partidos programados")
-        else:
-            for _, match in next_matches.iterrows():
-                is_home = match['home_team_name'] in team_variations
-                opponent = match['away_team_name'] if is_home else match['home_team_name']
-                opponent = normalize_team_name(opponent)
-
-                date_str = match['utcDate'].strftime('%d/%m/%Y')
-                location = 'Local' if is_home else 'Visitante'
-
-                status = match['status']
-                if status == 'POSTPONED':
-                    match_class = 'match-postponed'
-                    status_class = 'status-postponed'
-                    status_text = 'POSPUESTO'
-                else:
-                    match_class = 'match-scheduled'
-                    status_class = 'status-scheduled'
-                    status_text = 'PROGRAMADO'
-
-                match_html = f'''
-                <div class="match-card {match_class}">
-                    <div class="match-header">
-                        <div class="match-date">📅 {date_str} • {location}</div>
-                        <div class="match-status {status_class}">{status_text}</div>
-                    </div>
-                    <div class="match-teams">
-                        <div class="team-home">{team_name if is_home else opponent}</div>
-                        <div class="match-vs">vs</div>
-                        <div class="team-away">{opponent if is_home else team_name}</div>
-                    </div>
-                </div>
-                '''
-                st.markdown(match_html, unsafe_allow_html=True)
+    # minutes_played viene como texto con separador de miles ("1,062"): _coerce de src/schema.py lo pasa a número
+    df_plantilla, _ = read_table(data_dir, data_version, 'plantilla', team)
 
-@st.cache_data
-def load_data():
-    historico_path = Path("data/historico.csv")
-    convocatoria_path = Path("data/convocatoria_siguiente.csv")
-    jugadores_path = Path("data/jugadores_info.csv")
+    return df_plantilla
 
-    if not historico_path.exists():
-        st.error(f"❌ No se encontró: {historico_path}")
-        st.stop()
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def load_squad_cube(data_dir, data_version):
+    """Cubo de analítica de toda la liga, calculado una vez por partición"""
+    df_plantilla = load_plantilla(data_dir, data_version)
 
-    if not convocatoria_path.exists():
-        st.error(f"❌ No se encontró: {convocatoria_path}")
-        st.stop()
+    if df_plantilla is None:
+        return None
+
+    return SquadCube(df_plantilla)
+
+@st.cache_data(max_entries=MAX_TEAM_ENTRIES)
+def load_matches(data_dir, data_version, team=None):
+    source = get_data_source(data_dir)
 
-    df_historico = pd.read_csv(historico_path)
-    df_features_temporales = calculate_temporal_features_from_history(df_historico)
-    df_convocatoria = pd.read_csv(convocatoria_path)
+    if not source.exists('premier_matches'):
+        st.error(f"❌ No se encontró: {source.path('premier_matches')}")
+        return None
+
+    df_matches, _ = read_table(data_dir, data_version, 'premier_matches', team)
+    return df_matches
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def get_fixture_context_store(data_dir):
+    return FixtureContextStore.load(Path(data_dir) / "cache" / "fixture_context.pkl")
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS)
+def load_next_fixture_context(data_dir, data_version):
+    """Contexto del próximo partido de cada equipo, desde la tabla materializada"""
+    df_matches = load_matches(data_dir, data_version)
+
+    if df_matches is None:
+        return None
+
+    store = get_fixture_context_store(data_dir)
+    table = store.update(df_matches)
+    try:
+        store.save(Path(data_dir) / "cache" / "fixture_context.pkl")
+    except OSError:
+        pass
+
+    return next_fixture_context(table)
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS * 2)
+def load_predictions(data_dir, data_version, version):
+    """Probabilidades y explicaciones de todas las plantillas, en un lote por partición y modelo"""
+    model, scaler, spec = get_model_registry().get(version)
+    return predict_squads(load_data(data_dir, data_version), model, scaler, spec.features)
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS * 2)
+def load_model_comparison(data_dir, data_version, versions):
+    """Probabilidades de varias versiones del modelo sobre las mismas features"""
+    registry = get_model_registry()
+    scorers = {}
+    for version in versions:
+        model, scaler, spec = registry.get(version)
+        scorers[version] = (model, scaler, spec.features)
+    return compare_model_versions(load_data(data_dir, data_version), scorers)
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS * 2)
+def load_replacement_index(data_dir, data_version, version):
+    """Índice de similitud sobre las features escaladas de las predicciones"""
+    predictions = load_predictions(data_dir, data_version, version)
+    _, scaler, spec = get_model_registry().get(version)
+    feature_cols = list(spec.features or get_feature_columns())
+    return ReplacementIndex(predictions, scaler.transform(predictions[feature_cols]))
+
+def history_feature_frame(history_index):
+    """
+    Filas del histórico con player_last_3_avg tal como se conocía antes de cada
+    partido (sus 3 anteriores); la primera aparición de cada jugador no tiene valor y se omite
+    """
+    history = history_index.df
+    previous = history.groupby('id_player', sort=False)['minutesPlayed'].shift(1)
+    last_3_avg = previous.groupby(history['id_player'], sort=False).rolling(3, min_periods=1).mean()
+    history = history.assign(player_last_3_avg=last_3_avg.reset_index(level=0, drop=True))
+    return history[history['player_last_3_avg'].notna()]
+
+def frame_fingerprint(df):
+    """Huella corta del contenido de un DataFrame (columnas y valores)"""
+    digest = hashlib.sha1(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS * 2)
+def load_drift_reference(data_dir, data_version, version):
+    """
+    Sketches de referencia (histórico) por feature; se reajustan solo si cambia
+    el histórico. La huella guardada es la del índice con que se ajustan.
+    """
+    history_index = load_history_index(data_dir, data_version)
+    history_version = frame_fingerprint(history_index.df)
+    path = Path(data_dir) / "cache" / f"drift_reference_{version}.json"
+    _, _, spec = get_model_registry().get(version)
+    features = monitored_features(spec.features or get_feature_columns())
 
-    df_final = df_convocatoria.merge(
-        df_features_temporales[['id_player', 'player_last_3_avg'
-                                 ]],
-        on='id_player',
-        how='left'
+    try:
+        reference = DriftMonitor.load(path)
+        if reference.meta.get('history_version') == history_version and list(reference.sketches) == features:
+            return reference
+    except (OSError, ValueError, KeyError):
+        pass
+
+    reference = DriftMonitor.fit(
+        build_squad_features(history_feature_frame(history_index)),
+        features, meta={'history_version': history_version}
     )
+    try:
+        reference.save(path)
+    except OSError:
+        pass
+    return reference
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS * 2)
+def load_drift_report(data_dir, data_version, version):
+    """PSI y desplazamiento de la convocatoria actual frente al histórico"""
+    reference = load_drift_reference(data_dir, data_version, version)
+    current = reference.empty_like()
+    # Las features ya están calculadas en las predicciones: resumirlas es O(filas)
+    current.update(load_predictions(data_dir, data_version, version))
+    return reference.compare(current)
+
+def display_drift_warning(report):
+    """Aviso en la barra lateral cuando alguna feature se aleja de la referencia"""
+    drifted = report[report['status'] != 'ok']
+    if len(drifted) == 0:
+        return
 
-    if jugadores_path.exists():
-        df_jugadores = pd.read_csv(jugadores_path)
-        df_final = df_final.merge(
-            df_jugadores[['id_player', 'player_name', 'shirt_number']],
-            on='id_player',
-            how='left'
-        )
-        df_final['player_name'] = df_final['player_name'].fillna(
-            df_final['id_player'].astype(str).apply(lambda x: f"Jugador {x}")
-        )
-        df_final['shirt_number'] = df_final['shirt_number'].fillna(0).astype(int)
+    alerts = drifted[drifted['status'] == 'alert']
+    message = f"⚠️ Deriva en {len(drifted)} features: " + ", ".join(
+        f"{FEATURE_LABELS.get(row.feature, row.feature)} (PSI {row.psi:.2f})" for row in drifted.head(3).itertuples()
+    )
+    if len(alerts):
+        st.warning(message)
     else:
-        st.warning("⚠️ No se encontró data/jugadores_info.csv")
-        df_final['player_name'] = df_final['id_player'].astype(str).apply(lambda x: f"Jugador {x}")
-        df_final['shirt_number'] = 0
+        st.caption(message)
+
+    with st.expander("📉 Deriva de features"):
+        st.dataframe(
+            report,
+            column_config={
+                'feature': st.column_config.TextColumn('Feature'),
+                'psi': st.column_config.NumberColumn('PSI', format='%.3f'),
+                'reference_mean': st.column_config.NumberColumn('Media ref.', format='%.2f'),
+                'current_mean': st.column_config.NumberColumn('Media actual', format='%.2f'),
+                'shift_std': st.column_config.NumberColumn('Δ (σ)', format='%+.2f'),
+                'reference_p50': st.column_config.NumberColumn('P50 ref.', format='%.2f'),
+                'current_p50': st.column_config.NumberColumn('P50 actual', format='%.2f'),
+                'status': st.column_config.TextColumn('Estado')
+            },
+            hide_index=True, use_container_width=True
+        )
 
-    df_final['player_last_3_avg'].fillna(45.0, inplace=True)
+PREDICTION_STORE_PATH = DATA_DIR / "predictions.sqlite"
 
-    df_final['captain'] = df_final['captain'].apply(lambda x: 1 if x in [True, 1, '1'] else 0)
+def file_fingerprint(paths):
+    """Huella corta del contenido de varios archivos (versión de modelo o de datos)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
 
-    return df_final
+@st.cache_resource
+def get_prediction_store():
+    try:
+        return PredictionStore(PREDICTION_STORE_PATH)
+    except sqlite3.Error:
+        # Sin disco escribible la app funciona igual, solo sin histórico de predicciones
+        return None
 
 @st.cache_data
-def load_plantilla():
-    plantilla_path = Path("data/plantilla.csv")
-
-    if not plantilla_path.exists():
-        st.error(f"❌ No se encontró: {plantilla_path}")
+def get_model_version(version):
+    """Versión del registro + huella de sus archivos"""
+    spec = get_model_registry().specs[version]
+    return f"{version}@" + file_fingerprint([spec.model_path, spec.scaler_path])
+
+@st.cache_data(max_entries=MAX_LOADED_PARTITIONS * 4)
+def content_fingerprint(files):
+    """Huella del contenido; `files` lleva (ruta, tamaño, mtime) para que la entrada caduque al cambiar"""
+    return file_fingerprint([Path(path) for path, _, _ in files])
+
+def data_fingerprint(data_dir):
+    """Huella de los archivos de una partición; solo relee su contenido si cambió algún stat"""
+    source = get_data_source(data_dir)
+    files = []
+    for path in sorted({source.path(table) for table in DATA_TABLES}):
+        if path.exists():
+            stat = path.stat()
+            files.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return content_fingerprint(tuple(files))
+
+def get_data_version(partition_key, data_version):
+    """Partición + huella de sus archivos (distingue temporadas con los mismos equipos)"""
+    return f"{partition_key}@{data_version}"
+
+def record_prediction_run(data_dir, data_version, version, run_date, model_version, partition_key):
+    """Como save_prediction_run, pero un fallo del almacén no interrumpe la página"""
+    try:
+        return save_prediction_run(data_dir, data_version, version, run_date, model_version, partition_key)
+    except sqlite3.Error:
+        # Sin caché del fallo: se reintenta en el siguiente rerun
+        logger.exception("No se pudo guardar la ejecución de predicciones")
         return None
 
-    df_plantilla = pd.read_csv(plantilla_path)
-    df_plantilla['minutes_played'] = df_plantilla['minutes_played'].astype(str).str.replace(',', '').astype(int)
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS * 2)
+def save_prediction_run(data_dir, data_version, version, run_date, model_version, partition_key):
+    """
+    Guarda una vez (por día y versiones) las predicciones de todos los equipos,
+    con la huella de los datos con que se calcularon (`data_version`, la misma
+    clave de los loaders)
+    """
+    store = get_prediction_store()
 
-    return df_plantilla
+    if store is None:
+        return None
 
-@st.cache_data
-def load_matches():
-    matches_path = Path("data/premier_matches.csv")
+    predictions = load_predictions(data_dir, data_version, version)
+    model, scaler = load_model_and_scaler(version)
+    next_fixtures = load_next_fixture_context(data_dir, data_version)
+    match_ids = {} if next_fixtures is None else dict(zip(next_fixtures['team'], next_fixtures['match_id']))
 
-    if not matches_path.exists():
-        st.error(f"❌ No se encontró: {matches_path}")
-        return None
+    rows = []
+    for team in predictions['team'].unique():
+        lineup, bench_players = select_best_11_by_formation(predictions, model, scaler, team)
+        rows.extend(lineup_rows(team, lineup, bench_players, match_ids.get(team)))
 
-    df_matches = pd.read_csv(matches_path)
-    return df_matches
+    return store.record_run(rows, model_version, get_data_version(partition_key, data_version), run_date)
+
+MODELS_DIR = Path("models")
+# Presupuesto de memoria para modelos cargados a la vez (tamaño en memoria de modelo y scaler)
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get("ROTATION_MODEL_MEMORY_MB", 512))
 
 @st.cache_resource
-def load_model_and_scaler():
-    model = joblib.load(Path("models/xgboost_model.pkl"))
-    scaler = joblib.load(Path("models/scaler.pkl"))
+def get_model_registry():
+    """Registro de versiones del modelo compartido por el proceso (ver src/model_registry.py)"""
+    return ModelRegistry(MODELS_DIR, MODEL_MEMORY_BUDGET_MB, available_features=get_available_features())
+
+def load_model_and_scaler(version=None):
+    registry = get_model_registry()
+    model, scaler, _ = registry.get(version or registry.default_version())
     return model, scaler
 
+@st.cache_resource(max_entries=MAX_LOADED_PARTITIONS)
+def warm_start_worker(data_dir, data_version, version):
+    """Carga datos y modelo en paralelo y hace una predicción de calentamiento por equipo"""
+    ctx = get_script_run_ctx()
+
+    def attach_ctx():
+        # Los loaders usan st.cache_data / st.error: necesitan el contexto de la sesión
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    def warmup_predictions(results):
+        df = load_predictions(data_dir, data_version, version)
+        model, scaler = results['model']
+        for team in df['team'].unique():
+            select_best_11_by_formation(df, model, scaler, team)
+        load_replacement_index(data_dir, data_version, version)
+
+    warmup.warm_start(
+        {
+            'data': lambda: load_data(data_dir, data_version),
+            'plantilla': lambda: load_squad_cube(data_dir, data_version),
+            'matches': lambda: load_matches(data_dir, data_version),
+            'fixture_context': lambda: load_next_fixture_context(data_dir, data_version),
+            'model': lambda: load_model_and_scaler(version)
+        },
+        warmup=warmup_predictions,
+        initializer=attach_ctx
+    )
+
+    drift = load_drift_report(data_dir, data_version, version)
+    warmup.annotate(drift_psi=dict(zip(drift['feature'], drift['psi'].round(3))))
+    return warmup.get_status()
+
 def main():
     load_custom_css()
 
     # Logo principal de la app
     display_app_header()
 
-    df = load_data()
-    df_plantilla = load_plantilla()
-    df_matches = load_matches()
-    model, scaler = load_model_and_scaler()
+    # Solo se lista el árbol de carpetas; los datos se cargan al elegir partición
+    partitions = discover_partitions(DATA_DIR)
 
-    matches_count = len(df_matches) if df_matches is not None else 0
+    if not partitions:
+        st.error(f"❌ No se encontraron datos en {DATA_DIR}")
+        st.stop()
+
+    try:
+        check_db_path(len(partitions))
+    except ValueError as exc:
+        st.error(f"❌ {exc}")
+        st.stop()
 
     with st.sidebar:
         st.header("Configuración")
+        if len(partitions) > 1:
+            partition = st.selectbox(
+                "Competición y temporada:", partitions,
+                format_func=lambda p: p.label, key="partition"
+            )
+        else:
+            partition = partitions[0]
+
+    data_dir = partition.path
+    # Huella de los archivos de la partición, calculada una vez por rerun: todos los
+    # loaders la reciben, así que al cambiar los datos se invalidan juntos
+    data_version = data_fingerprint(data_dir)
+
+    registry = get_model_registry()
+    model_versions = registry.versions()
+
+    if not model_versions:
+        st.error(f"❌ No se encontraron modelos en {MODELS_DIR}")
+        st.stop()
+
+    default_version = registry.default_version(partition.competition)
+    compare_version = None
+
+    with st.sidebar:
+        for version, missing in registry.rejected.items():
+            st.warning(f"⚠️ Modelo {version} descartado: pide features que no se calculan ({', '.join(missing)})")
+
+        if len(model_versions) > 1:
+            model_version = st.selectbox(
+                "Modelo:", model_versions,
+                index=model_versions.index(default_version), key="model_version"
+            )
+            compare_options = [v for v in model_versions if v != model_version]
+            compare_version = st.selectbox(
+                "Comparar con:", [None] + compare_options,
+                format_func=lambda v: "—" if v is None else v, key="compare_version"
+            )
+        else:
+            model_version = default_version
+
+    # Con `python -m src.serve` el calentamiento ya corre desde el arranque del proceso:
+    # aquí solo se espera a lo que falte. Con `streamlit run` lo paga el primer visitante.
+    if warmup.is_ready():
+        warm_status = warm_start_worker(data_dir, data_version, model_version)
+    else:
+        with st.spinner("Preparando datos y modelo..."):
+            warm_status = warm_start_worker(data_dir, data_version, model_version)
+
+    df = load_data(data_dir, data_version)
+    squad_cube = load_squad_cube(data_dir, data_version)
+    model, scaler = load_model_and_scaler(model_version)
+
+    # Contexto de calendario unido por equipo a cada fila de la plantilla
+    next_fixtures = load_next_fixture_context(data_dir, data_version)
+    if next_fixtures is not None:
+        df = attach_fixture_context(df, next_fixtures)
+
+    prediction_store = get_prediction_store()
+    record_prediction_run(
+        data_dir, data_version, model_version, date.today(),
+        get_model_version(model_version), partition.key
+    )
+
+    aliases = partition.team_aliases
+    badges = partition.team_badges
+
+    with st.sidebar:
         teams = sorted(df['team'].unique())
-        selected_team = st.selectbox("Equipo:", teams, index=0)
+        selected_team = st.selectbox("Equipo:", teams, index=0, key="team")
+
+        if warmup.is_ready():
+            st.caption(f"🟢 Worker listo ({warm_status['total_seconds']:.1f}s de arranque)")
+
+        display_drift_warning(load_drift_report(data_dir, data_version, model_version))
+
+        display_data_quality(data_dir, data_version)
 
         st.markdown("---")
         st.markdown("### Descripción:")
-        st.markdown("""
-        MatchLineup AI es una aplicación web interactiva que predice las alineaciones de los equipos de la Premier League utilizando machine learning y algoritmos de IA.
+        st.markdown(f"""
+        MatchLineup AI es una aplicación web interactiva que predice las alineaciones de los equipos de la {partition.competition} utilizando machine learning y algoritmos de IA.
         """)
 
-    tab1, tab2, tab3 = st.tabs(["⚽ Alineación", "👥 Plantilla", "📅 Partidos"])
+    # Las vistas solo piden las filas del equipo (consulta indexada con el backend SQLite)
+    team_matches = load_matches(data_dir, data_version, tuple(team_name_variations(selected_team, aliases)))
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["⚽ Alineación", "👥 Plantilla", "📅 Partidos", "📈 Jugador", "📤 Subir Archivo"])
 
     with tab1:
         # Header con escudo CENTRADO
-        next_match = get_next_match(df_matches, selected_team)
-        display_team_header(selected_team, next_match, show_formation=True)
+        next_match = get_next_match(team_matches, selected_team, aliases)
+        display_team_header(selected_team, next_match, show_formation=True, badges=badges)
+        display_fixture_context(df[df['team'] == selected_team])
 
         # Título de sección DESPUÉS del header
         st.markdown("### 🎯 Alineación y Banca")
 
-        lineup, bench_players = select_best_11_by_formation(df, model, scaler, selected_team)
+        lineup, bench_players = select_best_11_by_formation(load_predictions(data_dir, data_version, model_version), model, scaler, selected_team)
 
         if lineup:
             display_formation_433(lineup, bench_players)
+            display_replacements(
+                load_replacement_index(data_dir, data_version, model_version), lineup, selected_team
+            )
         else:
             st.warning("⚠️ No hay jugadores")
 
+        if compare_version is not None:
+            comparison = load_model_comparison(data_dir, data_version, (model_version, compare_version))
+            display_model_comparison(comparison, selected_team, model_version, compare_version)
+
     with tab2:
-        if df_plantilla is not None:
+        if squad_cube is not None:
             # Header con escudo CENTRADO
-            next_match = get_next_match(df_matches, selected_team)
-            display_team_header(selected_team, next_match, show_formation=False)
+            next_match = get_next_match(team_matches, selected_team, aliases)
+            display_team_header(selected_team, next_match, show_formation=False, badges=badges)
 
             st.markdown("### 👥 Plantilla Completa")
 
-            team_plantilla = df_plantilla[df_plantilla['team'] == selected_team].copy()
+            team_plantilla = squad_cube.team_players(selected_team)
+            team_stats = squad_cube.team_stats(selected_team)
 
             if len(team_plantilla) == 0:
                 st.warning(f"⚠️ No se encontró información de plantilla para {selected_team}")
@@ -1004,51 +986,26 @@ def main():
                 col1, col2, col3, col4 = st.columns(4)
 
                 with col1:
-                    st.markdown(f'<div class="stat-card"><div class="stat-number">{len(team_plantilla)}</div><div class="stat-label">Jugadores</div></div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="stat-card"><div class="stat-number">{int(team_stats["players"])}</div><div class="stat-label">Jugadores</div></div>', unsafe_allow_html=True)
 
                 with col2:
-                    avg_age = team_plantilla['age'].mean()
-                    st.markdown(f'<div class="stat-card"><div class="stat-number">{avg_age:.1f}</div><div class="stat-label">Edad Promedio</div></div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="stat-card"><div class="stat-number">{team_stats["avg_age"]:.1f}</div><div class="stat-label">Edad Promedio</div></div>', unsafe_allow_html=True)
 
                 with col3:
-                    total_goals = team_plantilla['goals'].sum()
-                    st.markdown(f'<div class="stat-card"><div class="stat-number">{total_goals}</div><div class="stat-label">Goles Totales</div></div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="stat-card"><div class="stat-number">{int(team_stats["goals"])}</div><div class="stat-label">Goles Totales</div></div>', unsafe_allow_html=True)
 
                 with col4:
-                    total_assists = team_plantilla['assits'].sum()
-                    st.markdown(f'<div class="stat-card"><div class="stat-number">{total_assists}</div><div class="stat-label">Asistencias</div></div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="stat-card"><div class="stat-number">{int(team_stats["assists"])}</div><div class="stat-label">Asistencias</div></div>', unsafe_allow_html=True)
 
                 st.markdown("---")
 
                 st.markdown("#### 📋 Todos los Jugadores")
 
-                display_df = team_plantilla.copy()
-                display_df = display_df.sort_values('minutes_played', ascending=False)
-
-                pos_map = {'GK': '🧤 POR', 'DF': '🛡️ DEF', 'MF': '⚙️ MED', 'FW': '⚡ DEL'}
-                display_df['position_label'] = display_df['position'].map(pos_map)
-
-                display_df['goals_per_match'] = (display_df['goals'] / display_df['matchs']).fillna(0)
-                display_df['assists_per_match'] = (display_df['assits'] / display_df['matchs']).fillna(0)
-                display_df['minutes_per_match'] = (display_df['minutes_played'] / display_df['matchs']).fillna(0)
-
-                final_df = display_df[[
-                    'player_name', 'position_label', 'age', 'matchs', 
-                    'minutes_played', 'minutes_per_match', 'goals', 'goals_per_match',
-                    'assits', 'assists_per_match'
-                ]].copy()
-
-                final_df.columns = [
-                    'Jugador', 'Pos', 'Edad', 'PJ', 
-                    'Min', 'Min/PJ', 'Goles', 'G/PJ',
-                    'Asist', 'A/PJ'
-                ]
-
-                final_df['Min/PJ'] = final_df['Min/PJ'].apply(lambda x: f"{x:.0f}")
-                final_df['G/PJ'] = final_df['G/PJ'].apply(lambda x: f"{x:.2f}")
-                final_df['A/PJ'] = final_df['A/PJ'].apply(lambda x: f"{x:.2f}")
-
-                st.dataframe(final_df, use_container_width=True, hide_index=True, height=500)
+                st.dataframe(
+                    team_plantilla[SQUAD_TABLE_COLUMNS],
+                    column_config=SQUAD_TABLE_CONFIG,
+                    use_container_width=True, hide_index=True, height=500
+                )
 
                 st.markdown("---")
 
@@ -1056,42 +1013,64 @@ def main():
 
                 with col1:
                     st.markdown("#### ⚽ Top Goleadores")
-                    top_scorers = team_plantilla.nlargest(5, 'goals')[['player_name', 'goals', 'matchs']]
-                    top_scorers['goals_per_match'] = (top_scorers['goals'] / top_scorers['matchs']).apply(lambda x: f"{x:.2f}")
-                    top_scorers = top_scorers[['player_name', 'goals', 'goals_per_match']]
-                    top_scorers.columns = ['Jugador', 'Goles', 'G/PJ']
-                    st.dataframe(top_scorers, hide_index=True, use_container_width=True)
+                    display_leaderboard(squad_cube.leaderboard('goals', selected_team), ['goals', 'goals_per_match'])
 
                 with col2:
                     st.markdown("#### 🎯 Top Asistencias")
-                    top_assists = team_plantilla.nlargest(5, 'assits')[['player_name', 'assits', 'matchs']]
-                    top_assists['assists_per_match'] = (top_assists['assits'] / top_assists['matchs']).apply(lambda x: f"{x:.2f}")
-                    top_assists = top_assists[['player_name', 'assits', 'assists_per_match']]
-                    top_assists.columns = ['Jugador', 'Asist', 'A/PJ']
-                    st.dataframe(top_assists, hide_index=True, use_container_width=True)
+                    display_leaderboard(squad_cube.leaderboard('assists', selected_team), ['assits', 'assists_per_match'])
 
                 with col3:
                     st.markdown("#### ⏱️ Top Minutos")
-                    top_minutes = team_plantilla.nlargest(5, 'minutes_played')[['player_name', 'minutes_played', 'matchs']]
-                    top_minutes['minutes_per_match'] = (top_minutes['minutes_played'] / top_minutes['matchs']).apply(lambda x: f"{x:.0f}")
-                    top_minutes = top_minutes[['player_name', 'minutes_played', 'minutes_per_match']]
-                    top_minutes.columns = ['Jugador', 'Minutos', 'Min/PJ']
-                    st.dataframe(top_minutes, hide_index=True, use_container_width=True)
+                    display_leaderboard(squad_cube.leaderboard('minutes', selected_team), ['minutes_played', 'minutes_per_match'])
+
+            st.markdown("---")
+
+            st.markdown("### 🏆 Líderes de la Liga")
+
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.markdown("#### ⚽ Goles")
+                display_leaderboard(squad_cube.leaderboard('goals'), ['team', 'goals', 'goals_per_match'])
+
+            with col2:
+                st.markdown("#### 🎯 Asistencias")
+                display_leaderboard(squad_cube.leaderboard('assists'), ['team', 'assits', 'assists_per_match'])
+
+            with col3:
+                st.markdown("#### ⏱️ Minutos")
+                display_leaderboard(squad_cube.leaderboard('minutes'), ['team', 'minutes_played', 'minutes_per_match'])
+
+            with col4:
+                st.markdown("#### 🔥 G+A por 90'")
+                display_leaderboard(squad_cube.leaderboard('goal_contributions_per_90'), ['team', 'goal_contributions_per_90', 'minutes_played'])
         else:
             st.error("❌ No se pudo cargar el archivo de plantilla")
 
     with tab3:
-        if df_matches is not None:
+        if team_matches is not None:
             # Header con escudo CENTRADO
-            next_match = get_next_match(df_matches, selected_team)
-            display_team_header(selected_team, next_match, show_formation=False)
+            next_match = get_next_match(team_matches, selected_team, aliases)
+            display_team_header(selected_team, next_match, show_formation=False, badges=badges)
 
             st.markdown("### 📅 Calendario de Partidos")
 
-            display_team_matches(df_matches, selected_team)
+            display_team_matches(team_matches, selected_team, aliases)
+
+            display_prediction_accuracy(prediction_store, load_history_index(data_dir, data_version), selected_team)
         else:
             st.error("❌ No se pudo cargar el archivo de partidos")
 
+    with tab4:
+        st.markdown("### 📈 Evolución del Jugador")
+
+        display_player_drilldown(load_player_history(data_dir, data_version), df, selected_team, prediction_store)
+
+    with tab5:
+        st.markdown("### 📤 Probabilidades para un Archivo Propio")
+
+        display_upload_scoring(data_dir, data_version, model_version)
+
     st.markdown("---")
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+"""
+Escudos locales: se generan una vez, se guardan en el repositorio y la app
+los incrusta en el HTML (data URI), sin peticiones a servidores externos ni
+a la propia app al renderizar.
+
+Estructura:
+    assets/badges/<equipo>.png|jpg|webp|svg   <- originales opcionales (nombre del equipo canónico)
+    static/badges/<slug>.<hash>.png            <- generados, redimensionados
+    static/badges/manifest.json                <- {slug del equipo: archivo}
+
+Uso:
+    python -m src.badges --source assets/badges --output static/badges --data-dir data
+
+Los equipos de data/ sin original reciben un monograma (iniciales sobre un
+círculo de color estable). Todos los escudos, también los SVG (con
+cairosvg, solo necesario al generarlos), se rasterizan al tamaño con que se
+muestran. El nombre de cada archivo lleva el hash de su contenido: el sitio
+estático de `python -m src.export` puede servirlos con caché indefinida.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from src.datasource import open_source
+from src.partitions import discover_partitions
+
+SOURCE_DIR = Path('assets/badges')
+OUTPUT_DIR = Path('static/badges')
+MANIFEST_FILE = 'manifest.json'
+BADGE_SIZE = 200  # 2x los 100 px con que se muestran
+SOURCE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.svg'}
+
+
+def slugify(text):
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def monogram(team_name):
+    """Iniciales del equipo: una por palabra (hasta 3) o las 3 primeras letras si es una sola"""
+    words = [word for word in re.findall(r'[A-Za-z]+', slugify(team_name).replace('-', ' ')) if word not in ('fc', 'afc')]
+    if len(words) > 1:
+        return ''.join(word[0] for word in words[:3]).upper()
+    return (words[0][:3] if words else '?').upper()
+
+
+def _monogram_png(team_name, size):
+    from PIL import Image, ImageDraw, ImageFont
+
+    # Color estable por equipo (mismo nombre -> mismo escudo)
+    red, green, blue = hashlib.sha1(slugify(team_name).encode()).digest()[:3]
+    fill = (64 + red // 2, 64 + green // 2, 64 + blue // 2, 255)
+
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    border = max(size // 32, 1)
+    draw.ellipse((border, border, size - border, size - border), fill=fill, outline='white', width=border * 2)
+    text = monogram(team_name)
+    font = ImageFont.load_default(size=size * (0.4 if len(text) < 3 else 0.3))
+    draw.text((size / 2, size / 2), text, font=font, anchor='mm', fill='white')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _render_svg(path, size):
+    # Dependencia opcional: solo hace falta para generar escudos desde SVG
+    import cairosvg
+
+    return io.BytesIO(cairosvg.svg2png(url=str(path), output_width=size))
+
+
+def _rasterize(path, size):
+    from PIL import Image, ImageOps
+
+    source = _render_svg(path, size) if path.suffix.lower() == '.svg' else path
+    with Image.open(source) as image:
+        image = ImageOps.contain(image.convert('RGBA'), (size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def data_teams(data_dir='data'):
+    """Equipos de todas las particiones de `data_dir` (los de la convocatoria)"""
+    teams = set()
+    for partition in discover_partitions(data_dir):
+        df, _ = open_source(data_dir=partition.path).read('convocatoria_siguiente')
+        teams.update(df['team'].dropna().unique())
+    return sorted(teams)
+
+
+def build_badges(source=SOURCE_DIR, output=OUTPUT_DIR, size=BADGE_SIZE, teams=()):
+    """
+    Genera los escudos PNG redimensionados y el manifest; devuelve {slug: archivo}.
+    Los `teams` sin original reciben un monograma. Solo borra los archivos que
+    listaba el manifest anterior (los que generó).
+    """
+    source, output = Path(source), Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    previous = load_badge_manifest(output)
+
+    images = {}
+    for path in sorted(source.iterdir()) if source.exists() else []:
+        if path.is_file() and path.suffix.lower() in SOURCE_SUFFIXES:
+            images[slugify(path.stem)] = _rasterize(path, size)
+    for team in teams:
+        if slugify(team) not in images:
+            images[slugify(team)] = _monogram_png(team, size)
+
+    manifest = {}
+    for slug, data in images.items():
+        name = f'{slug}.{hashlib.sha1(data).hexdigest()[:10]}.png'
+        if not (output / name).exists():
+            (output / name).write_bytes(data)
+        manifest[slug] = name
+
+    # Versiones anteriores que ya no referencia el manifest
+    for name in set(previous.values()) - set(manifest.values()):
+        stale = output / name
+        if stale.is_file():
+            stale.unlink()
+
+    (output / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def load_badge_manifest(output=OUTPUT_DIR):
+    try:
+        return json.loads((Path(output) / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def badge_data_uris(output=OUTPUT_DIR):
+    """{slug: data URI} de los escudos del manifest, para incrustarlos en el HTML"""
+    uris = {}
+    for slug, name in load_badge_manifest(output).items():
+        try:
+            data = (Path(output) / name).read_bytes()
+        except OSError:
+            continue
+        uris[slug] = 'data:image/png;base64,' + base64.b64encode(data).decode()
+    return uris
+
+
+def local_badge_url(manifest, team_name, prefix=''):
+    """URL del escudo local del equipo (`prefix` + valor del manifest), o None si no se generó"""
+    name = manifest.get(slugify(team_name))
+    return prefix + name if name else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los escudos locales desde assets/badges y data/")
+    parser.add_argument('--source', default=str(SOURCE_DIR))
+    parser.add_argument('--output', default=str(OUTPUT_DIR))
+    parser.add_argument('--size', type=int, default=BADGE_SIZE, help="Lado máximo en píxeles")
+    parser.add_argument('--data-dir', default='data', help="Equipos que necesitan escudo (monograma si no hay original)")
+    args = parser.parse_args(argv)
+
+    manifest = build_badges(args.source, args.output, args.size, data_teams(args.data_dir))
+    print(f"✅ {len(manifest)} escudos en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Capa de acceso a datos intercambiable: CSV planos o base de datos SQLite.
+
+Ambos backends exponen `read(table, team=None)` -> (DataFrame, incidencias),
+de modo que load_data / load_plantilla / load_matches no dependen del
+formato. `team` es un nombre o una lista de nombres (las variantes con que
+aparece un equipo en cada archivo). El backend SQLite tiene índices por
+equipo, jugador y fecha y un pool de conexiones de solo lectura compartido
+entre sesiones, así que una vista puede pedir solo las filas de su equipo.
+Las incidencias de validación se guardan al importar y se devuelven igual
+que con los CSV.
+
+Importación única desde los CSV de data/:
+    python -m src.datasource --data-dir data --db data/rotation.db
+
+Por defecto cada partición usa <carpeta de la partición>/rotation.db.
+ROTATION_DB_PATH la cambia y puede llevar `{partition}` (la carpeta de la
+partición, p. ej. /srv/db/{partition}/rotation.db); sin él, la misma base
+serviría a todas las particiones y solo se admite si hay una.
+"""
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from src.schema import ISSUE_COLUMNS, validate
+
+# Tabla -> columnas de equipo (filtro por equipo) e índices a crear
+TABLES = {
+    'convocatoria_siguiente': {
+        'team_columns': ['team'],
+        'indexes': [['team'], ['id_player']]
+    },
+    'historico': {
+        'team_columns': ['team'],
+        'indexes': [['team'], ['id_player'], ['id_player', 'date'], ['match_id']]
+    },
+    'jugadores_info': {
+        'team_columns': [],
+        'indexes': [['id_player']]
+    },
+    'plantilla': {
+        'team_columns': ['team'],
+        'indexes': [['team'], ['player_name']]
+    },
+    'premier_matches': {
+        'team_columns': ['home_team_name', 'away_team_name'],
+        'indexes': [['home_team_name', 'utcDate'], ['away_team_name', 'utcDate'], ['utcDate']]
+    }
+}
+
+
+# Tabla con las incidencias de validación de la importación
+REPORT_TABLE = '_validation_report'
+# En ROTATION_DB_PATH, se sustituye por la carpeta de cada partición
+PARTITION_PLACEHOLDER = '{partition}'
+
+
+def _empty_report():
+    return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+
+def _team_names(team):
+    return [team] if isinstance(team, str) else list(team)
+
+
+def _filter_team(df, table, team):
+    if team is None:
+        return df
+    names = _team_names(team)
+    mask = pd.Series(False, index=df.index)
+    for column in TABLES[table]['team_columns']:
+        mask |= df[column].isin(names)
+    return df[mask]
+
+
+class CSVSource:
+    """Backend de archivos CSV (lee el archivo completo y filtra en memoria)"""
+
+    name = 'csv'
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+
+    def path(self, table):
+        return self.data_dir / f'{table}.csv'
+
+    def exists(self, table):
+        return self.path(table).exists()
+
+    def read(self, table, team=None):
+        path = self.path(table)
+        df, report = validate(pd.read_csv(path), path.name)
+        return _filter_team(df, table, team).reset_index(drop=True), report
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones SQLite de solo lectura reutilizadas entre hilos/sesiones.
+
+    Una conexión abierta sigue leyendo el archivo que había al abrirla, así
+    que tras una reimportación (os.replace de la base) el pool lo detecta por
+    la huella del archivo y abre conexiones nuevas; las antiguas se cierran
+    al devolverse.
+    """
+
+    def __init__(self, db_path, size=4):
+        self.db_path = Path(db_path).resolve()
+        self.uri = f'file:{self.db_path}?mode=ro'
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self.generation = 0
+
+    def _current_fingerprint(self):
+        try:
+            stat = self.db_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _refresh(self):
+        """Descarta las conexiones inactivas si la base cambió desde que se abrieron"""
+        fingerprint = self._current_fingerprint()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+            self._fingerprint = fingerprint
+            self.generation += 1
+            while True:
+                try:
+                    _, conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        # Cada hueco del pool es una conexión (creada bajo demanda)
+        self._slots.get()
+        try:
+            self._refresh()
+            try:
+                generation, conn = self._idle.get_nowait()
+            except queue.Empty:
+                generation, conn = self.generation, self._connect()
+            try:
+                yield conn
+            finally:
+                if generation == self.generation:
+                    self._idle.put((generation, conn))
+                else:
+                    conn.close()
+        finally:
+            self._slots.put(None)
+
+
+class SQLiteSource:
+    """Backend SQLite con consultas filtradas por equipo sobre columnas indexadas"""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path, pool_size=4):
+        self.db_path = Path(db_path)
+        self.pool = ConnectionPool(self.db_path, pool_size)
+        self._tables = None
+        self._tables_generation = None
+
+    def path(self, table):
+        return self.db_path
+
+    def exists(self, table):
+        if not self.db_path.exists():
+            return False
+        with self.pool.connection() as conn:
+            # Lista de tablas cacheada mientras no se reimporte la base
+            if self._tables is None or self._tables_generation != self.pool.generation:
+                rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+                self._tables = {name for (name,) in rows}
+                self._tables_generation = self.pool.generation
+        return table in self._tables
+
+    def read(self, table, team=None):
+        sql = f'SELECT * FROM "{table}"'
+        params = []
+        team_columns = TABLES[table]['team_columns']
+        if team is not None and team_columns:
+            names = _team_names(team)
+            placeholders = ', '.join('?' * len(names))
+            sql += ' WHERE ' + ' OR '.join(f'"{column}" IN ({placeholders})' for column in team_columns)
+            params = names * len(team_columns)
+
+        file = f'{table}.csv'
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+            try:
+                report = pd.read_sql_query(
+                    f'SELECT * FROM "{REPORT_TABLE}" WHERE file = ?', conn, params=[file]
+                )
+            except pd.errors.DatabaseError:
+                # Base importada antes de guardar las incidencias
+                report = _empty_report()
+
+        # Las filas ya se validaron al importar: validar de nuevo solo restaura los
+        # tipos que SQLite no conserva (fechas, enteros); las incidencias son las guardadas.
+        df, _ = validate(df, file)
+        return df, report
+
+
+def partition_db_path(data_dir):
+    """Base SQLite de una partición: ROTATION_DB_PATH con `{partition}` sustituido o <data_dir>/rotation.db"""
+    template = os.environ.get('ROTATION_DB_PATH')
+    if template is None:
+        return Path(data_dir) / 'rotation.db'
+    return Path(template.replace(PARTITION_PLACEHOLDER, str(data_dir)))
+
+
+def check_db_path(partition_count):
+    """ValueError si ROTATION_DB_PATH apunta a una sola base y hay varias particiones"""
+    template = os.environ.get('ROTATION_DB_PATH')
+    if (
+        os.environ.get('ROTATION_DATA_BACKEND', 'csv') == 'sqlite' and template is not None
+        and PARTITION_PLACEHOLDER not in template and partition_count > 1
+    ):
+        raise ValueError(
+            f"ROTATION_DB_PATH={template} serviría la misma base a las {partition_count} particiones: "
+            f"añade {PARTITION_PLACEHOLDER} a la ruta"
+        )
+
+
+def open_source(backend=None, data_dir='data', db_path=None):
+    """Backend configurado (ROTATION_DATA_BACKEND=csv|sqlite, ROTATION_DB_PATH)"""
+    backend = backend or os.environ.get('ROTATION_DATA_BACKEND', 'csv')
+    if backend == 'sqlite':
+        return SQLiteSource(db_path or partition_db_path(data_dir))
+    if backend == 'csv':
+        return CSVSource(data_dir)
+    raise ValueError(f"Backend de datos desconocido: {backend}")
+
+
+def import_csv_dir(data_dir, db_path):
+    """Crea la base de datos desde los CSV de `data_dir`; devuelve las incidencias de validación"""
+    csv_source = CSVSource(data_dir)
+    db_path = Path(db_path)
+    tmp_path = db_path.with_suffix(db_path.suffix + '.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    reports = []
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            for table, spec in TABLES.items():
+                if not csv_source.exists(table):
+                    continue
+                df, report = csv_source.read(table)
+                reports.append(report)
+
+                # Fechas como texto ISO para que se ordenen bien en SQLite
+                for column in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+                    df[column] = df[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+                df.to_sql(table, conn, index=False)
+                for columns in spec['indexes']:
+                    if all(column in df.columns for column in columns):
+                        index_name = f'idx_{table}_' + '_'.join(columns)
+                        quoted = ', '.join(f'"{column}"' for column in columns)
+                        conn.execute(f'CREATE INDEX "{index_name}" ON "{table}" ({quoted})')
+
+            report = pd.concat(reports, ignore_index=True) if reports else _empty_report()
+            report.astype({'value': str}).to_sql(REPORT_TABLE, conn, index=False)
+            conn.execute(f'CREATE INDEX "idx_{REPORT_TABLE}_file" ON "{REPORT_TABLE}" (file)')
+            conn.execute('ANALYZE')
+        conn.close()
+
+        # Reemplazo atómico: los lectores nunca ven una base a medio importar
+        os.replace(tmp_path, db_path)
+    finally:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa los CSV de data/ a una base SQLite indexada")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--db', default='data/rotation.db')
+    args = parser.parse_args(argv)
+
+    report = import_csv_dir(args.data_dir, args.db)
+    print(f"✅ Base de datos creada en {args.db}")
+    if len(report):
+        print(f"⚠️ {len(report)} incidencias de validación:")
+        print(report.groupby(['file', 'column', 'issue']).size().to_string())
+
+
+if __name__ == "__main__":
+    main()
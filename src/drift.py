@@ -0,0 +1,239 @@
+"""
+Monitor de deriva de las features del modelo con memoria constante.
+
+Por cada feature se guarda un resumen compacto en lugar de los datos:
+  - numéricas: media y varianza online (Welford/Chan) y un histograma sobre
+    los deciles de la referencia, que sirve de sketch de cuantiles y de
+    base para el PSI (Population Stability Index);
+  - discretas (posición, grupo de edad, nivel de mercado): frecuencias.
+
+La referencia se ajusta una vez sobre el histórico y se guarda en JSON.
+Las features relativas al lote no se vigilan (ver BATCH_RELATIVE_FEATURES).
+Cada carga nueva se resume en O(filas nuevas) con los mismos cortes y se
+compara con ella.
+"""
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+N_BINS = 10
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+DISCRETE_FEATURES = {'pos_D', 'pos_F', 'pos_G', 'pos_M', 'age_group_encoded', 'market_tier_encoded'}
+# Relativas al lote (create_features las calcula sobre toda la convocatoria del
+# equipo): el histórico, con una fila por aparición, no tiene un equivalente
+# comparable y darían deriva aunque los jugadores no cambien
+BATCH_RELATIVE_FEATURES = {'country_frequency', 'team_avg_market_value', 'team_frequency'}
+REPORT_COLUMNS = [
+    'feature', 'psi', 'reference_mean', 'current_mean', 'shift_std',
+    'reference_p50', 'current_p50', 'status'
+]
+
+
+def monitored_features(features):
+    """Features del modelo que se vigilan (todas menos las relativas al lote)"""
+    return [feature for feature in features if feature not in BATCH_RELATIVE_FEATURES]
+
+
+class NumericSketch:
+    """Media/varianza online e histograma con cortes fijos"""
+
+    kind = 'numeric'
+
+    def __init__(self, edges, count=0, mean=0.0, m2=0.0, bins=None):
+        self.edges = np.asarray(edges, dtype=float)
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.bins = np.zeros(len(self.edges) + 1, dtype=np.int64) if bins is None else np.asarray(bins, dtype=np.int64)
+
+    @classmethod
+    def fit(cls, values, n_bins=N_BINS):
+        values = np.asarray(values, dtype=float)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])) if len(values) else []
+        return cls(edges)
+
+    def empty_like(self):
+        return NumericSketch(self.edges)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        n = len(values)
+        if n == 0:
+            return
+
+        # Combinación de (n, media, M2) del lote con la acumulada (Chan et al.)
+        batch_mean = values.mean()
+        batch_m2 = ((values - batch_mean) ** 2).sum()
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+        self.bins += np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(self.bins))
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q):
+        """Cuantil aproximado desde el histograma (interpolando dentro del bin)"""
+        if self.count == 0 or len(self.edges) == 0:
+            return self.mean
+        target = q * self.count
+        cumulative = np.cumsum(self.bins)
+        i = int(np.searchsorted(cumulative, target))
+        # Los bins extremos no tienen límite exterior: se acota al corte conocido
+        low = self.edges[max(i - 1, 0)]
+        high = self.edges[min(i, len(self.edges) - 1)]
+        before = cumulative[i - 1] if i > 0 else 0
+        fraction = (target - before) / self.bins[i] if self.bins[i] else 0.0
+        return low + (high - low) * fraction
+
+    def distribution(self, other=None):
+        return self.bins / max(self.count, 1)
+
+    def to_dict(self):
+        return {
+            'kind': self.kind, 'edges': self.edges.tolist(), 'count': self.count,
+            'mean': self.mean, 'm2': self.m2, 'bins': self.bins.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['edges'], data['count'], data['mean'], data['m2'], data['bins'])
+
+
+class CategorySketch:
+    """Frecuencias por categoría"""
+
+    kind = 'category'
+
+    def __init__(self, counts=None):
+        self.counts = dict(counts or {})
+
+    @classmethod
+    def fit(cls, values):
+        return cls()
+
+    def empty_like(self):
+        return CategorySketch()
+
+    def update(self, values):
+        for value, n in pd.Series(values).astype(str).value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(n)
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    @property
+    def mean(self):
+        # Media de las categorías numéricas (todas las discretas del modelo lo son)
+        total = self.count
+        return sum(float(value) * n for value, n in self.counts.items()) / total if total else 0.0
+
+    @property
+    def std(self):
+        total = self.count
+        if total < 2:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(sum(n * (float(value) - mean) ** 2 for value, n in self.counts.items()) / (total - 1))
+
+    def quantile(self, q):
+        target = q * self.count
+        cumulative = 0
+        for value, n in sorted(self.counts.items(), key=lambda item: float(item[0])):
+            cumulative += n
+            if cumulative >= target:
+                return float(value)
+        return self.mean
+
+    def distribution(self, other=None):
+        keys = sorted(set(self.counts) | set(other.counts if other is not None else ()))
+        total = max(self.count, 1)
+        return np.array([self.counts.get(key, 0) / total for key in keys])
+
+    def to_dict(self):
+        return {'kind': self.kind, 'counts': self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['counts'])
+
+
+SKETCHES = {NumericSketch.kind: NumericSketch, CategorySketch.kind: CategorySketch}
+
+
+def psi(expected, actual, eps=1e-4):
+    """Population Stability Index entre dos distribuciones sobre los mismos bins"""
+    expected = np.clip(expected, eps, None)
+    actual = np.clip(actual, eps, None)
+    return float(((actual - expected) * np.log(actual / expected)).sum())
+
+
+class DriftMonitor:
+    """Sketches por feature; `fit` sobre la referencia y `empty_like` para cada carga nueva"""
+
+    def __init__(self, sketches, meta=None):
+        self.sketches = sketches
+        self.meta = meta or {}
+
+    @classmethod
+    def fit(cls, reference, features, meta=None):
+        sketches = {}
+        for feature in features:
+            sketch_cls = CategorySketch if feature in DISCRETE_FEATURES else NumericSketch
+            sketches[feature] = sketch_cls.fit(reference[feature])
+        monitor = cls(sketches, meta)
+        monitor.update(reference)
+        return monitor
+
+    def empty_like(self):
+        return DriftMonitor({feature: sketch.empty_like() for feature, sketch in self.sketches.items()})
+
+    def update(self, df):
+        """Añade las filas de `df` a los sketches (O(filas))"""
+        for feature, sketch in self.sketches.items():
+            if feature in df.columns:
+                sketch.update(df[feature].to_numpy())
+
+    def compare(self, current):
+        """Deriva de `current` respecto a esta referencia, de mayor a menor PSI"""
+        rows = []
+        for feature, reference in self.sketches.items():
+            observed = current.sketches[feature]
+            if observed.count == 0:
+                continue
+
+            score = psi(reference.distribution(observed), observed.distribution(reference))
+            shift = (observed.mean - reference.mean) / reference.std if reference.std else 0.0
+            status = 'alert' if score >= PSI_ALERT else 'warning' if score >= PSI_WARNING else 'ok'
+            rows.append((
+                feature, score, reference.mean, observed.mean, shift,
+                reference.quantile(0.5), observed.quantile(0.5), status
+            ))
+
+        report = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+        return report.sort_values('psi', ascending=False).reset_index(drop=True)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'meta': self.meta, 'sketches': {feature: sketch.to_dict() for feature, sketch in self.sketches.items()}}
+        path.write_text(json.dumps(data))
+
+    @classmethod
+    def load(cls, path):
+        data = json.loads(Path(path).read_text())
+        sketches = {
+            feature: SKETCHES[sketch['kind']].from_dict(sketch)
+            for feature, sketch in data['sketches'].items()
+        }
+        return cls(sketches, data.get('meta'))
@@ -0,0 +1,62 @@
+"""Explicaciones por jugador con las contribuciones nativas de XGBoost (pred_contribs)."""
+import numpy as np
+import pandas as pd
+
+FEATURE_LABELS = {
+    'market_value_log': 'Valor de mercado',
+    'value_age_decay': 'Valor según edad',
+    'captain_x_market': 'Capitanía',
+    'position_x_age': 'Posición y edad',
+    'player_convocations': 'Experiencia',
+    'player_last_3_avg': 'Min. últimos 3',
+    'team_avg_market_value': 'Valor medio equipo',
+    'player_value_vs_team': 'Valor vs equipo',
+    'pos_D': 'Posición',
+    'pos_F': 'Posición',
+    'pos_G': 'Posición',
+    'pos_M': 'Posición',
+    'country_frequency': 'País',
+    'team_frequency': 'Equipo',
+    'age_group_encoded': 'Grupo de edad',
+    'market_tier_encoded': 'Nivel de mercado'
+}
+
+CONTRIB_PREFIX = 'contrib_'
+
+
+def feature_contributions(model, X_scaled, feature_names):
+    """
+    Contribuciones (log-odds) de cada feature para todas las filas en una
+    sola llamada al booster. Devuelve (DataFrame de contribuciones, sesgo).
+    """
+    import xgboost as xgb
+
+    booster = model.get_booster()
+    dmatrix = xgb.DMatrix(np.asarray(X_scaled), feature_names=booster.feature_names)
+
+    # Mismo rango de árboles que predict_proba cuando hubo early stopping
+    best_iteration = getattr(model, 'best_iteration', None)
+    iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+
+    contribs = booster.predict(dmatrix, pred_contribs=True, iteration_range=iteration_range)
+    contributions = pd.DataFrame(
+        contribs[:, :-1], columns=[f'{CONTRIB_PREFIX}{name}' for name in feature_names]
+    )
+    return contributions, contribs[:, -1]
+
+
+def top_contributions(contributions, feature_names, k=3):
+    """
+    Las `k` etiquetas con más peso (en valor absoluto) de cada fila: [(etiqueta, valor), ...].
+    Las columnas con la misma etiqueta (el one-hot pos_*) se suman antes de ordenar:
+    sus contribuciones son aditivas y juntas describen una sola feature.
+    """
+    codes, labels = pd.factorize(pd.Series([FEATURE_LABELS.get(name, name) for name in feature_names]))
+    grouping = np.zeros((len(feature_names), len(labels)))
+    grouping[np.arange(len(feature_names)), codes] = 1.0
+    values = contributions.to_numpy() @ grouping
+
+    order = np.argsort(-np.abs(values), axis=1)[:, :k]
+    top_values = np.take_along_axis(values, order, axis=1)
+    top_labels = np.asarray(labels, dtype=object)[order]
+    return [list(zip(row_labels.tolist(), row_values.tolist())) for row_labels, row_values in zip(top_labels, top_values)]
@@ -0,0 +1,262 @@
+"""
+Exporta las páginas de todos los equipos a HTML estático servible desde un CDN.
+
+Uso:
+    python -m src.export --output site
+
+Por cada partición se genera site/<competición>/<temporada>/<equipo>.html
+(alineación, banca, plantilla y partidos) con el mismo HTML/CSS de la app
+(src/render.py), más site/index.html y site/index.json. El índice guarda la
+huella de las entradas de cada página: en la siguiente exportación solo se
+reescriben las páginas cuyos datos, predicciones o plantillas cambiaron.
+Con --partition el índice conserva las particiones que no se exportan.
+
+Los datos y el modelo se cargan con los mismos módulos que usa app.py
+(src/datasource.py, src/pipeline.py, src/model_registry.py), sin Streamlit.
+"""
+import argparse
+import hashlib
+import html
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from src import badges, render
+from src.badges import slugify
+from src.datasource import check_db_path, open_source
+from src.history import HistoryIndex
+from src.model_registry import ModelRegistry
+from src.partitions import discover_partitions
+from src.pipeline import fit_imputer, get_available_features, predict_squads, select_best_11_by_formation, squad_frame
+from src.render import (
+    SQUAD_TABLE_COLUMNS, SQUAD_TABLE_LABELS, bench_html, formation_html, get_next_match,
+    page_html, team_badge_url, team_header_html, team_match_summary
+)
+from src.squad_cube import SquadCube
+
+DATA_DIR = Path('data')
+MODELS_DIR = Path('models')
+INDEX_FILE = 'index.json'
+SITE_BADGE_DIR = 'static/badges'
+
+
+def fingerprint(payload):
+    """Huella estable de las entradas de una página"""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def template_version():
+    # Cualquier cambio en el HTML/CSS de render.py regenera todas las páginas
+    return hashlib.sha1(Path(render.__file__).read_bytes()).hexdigest()[:12]
+
+
+def model_version_label(spec):
+    """Versión del registro + huella de sus archivos (como get_model_version en app.py)"""
+    digest = hashlib.sha1()
+    for path in (spec.model_path, spec.scaler_path):
+        if path.exists():
+            digest.update(path.read_bytes())
+    return f"{spec.version}@" + digest.hexdigest()[:12]
+
+
+def load_previous_index(output):
+    """Entradas de partición de la exportación anterior (vacío si no hay índice)"""
+    try:
+        index = json.loads((output / INDEX_FILE).read_text())
+    except (OSError, ValueError):
+        return []
+    return index.get('partitions', [])
+
+
+def previous_hashes(entries):
+    """{ruta de página: huella} de las entradas del índice anterior"""
+    return {page['path']: page['hash'] for entry in entries for page in entry.get('teams', [])}
+
+
+def merge_index(previous, exported, output):
+    """
+    Índice completo: las entradas exportadas sustituyen a las de su clave y
+    las demás se conservan en su orden si sus páginas siguen en el sitio.
+    """
+    exported_by_key = {entry['key']: entry for entry in exported}
+    merged = []
+    for entry in previous:
+        if entry.get('key') in exported_by_key:
+            merged.append(exported_by_key.pop(entry['key']))
+        elif all((output / page['path']).exists() for page in entry.get('teams', [])):
+            merged.append(entry)
+    return merged + list(exported_by_key.values())
+
+
+def load_partition(partition, model, scaler, features):
+    """(predicciones, cubo de plantillas, partidos) de una partición, igual que los loaders de app.py"""
+    source = open_source(data_dir=partition.path)
+
+    df_matches = source.read('premier_matches')[0] if source.exists('premier_matches') else None
+    history_index = HistoryIndex(source.read('historico')[0], df_matches)
+    df_jugadores = source.read('jugadores_info')[0] if source.exists('jugadores_info') else None
+    df = squad_frame(source.read('convocatoria_siguiente')[0], history_index, fit_imputer(history_index), df_jugadores)
+
+    squad_cube = SquadCube(source.read('plantilla')[0]) if source.exists('plantilla') else None
+    return predict_squads(df, model, scaler, features), squad_cube, df_matches
+
+
+def copy_badges(output):
+    """Copia los escudos del manifest local al sitio (nombres con hash: solo los nuevos)"""
+    manifest = badges.load_badge_manifest(badges.OUTPUT_DIR)
+    if not manifest:
+        return
+    target = output / SITE_BADGE_DIR
+    target.mkdir(parents=True, exist_ok=True)
+    for name in manifest.values():
+        path = badges.OUTPUT_DIR / name
+        if path.is_file() and not (target / name).exists():
+            shutil.copy2(path, target / name)
+
+
+def squad_table_html(squad, labels):
+    return squad.rename(columns=labels).to_html(
+        index=False, classes='squad-table', border=0, na_rep='—', float_format='{:.2f}'.format
+    )
+
+
+def team_page_body(header, lineup, bench_players, squad_html, matches, home_href):
+    body = f'<p><a href="{home_href}">← Todos los equipos</a></p>{header}'
+
+    body += '<h3>🎯 Alineación y Banca</h3>'
+    if lineup:
+        body += formation_html(lineup)
+        if bench_players:
+            body += bench_html(bench_players)
+
+    if squad_html:
+        body += f'<h3>👥 Plantilla Completa</h3>{squad_html}'
+
+    if matches:
+        body += '<h3>📅 Calendario de Partidos</h3>'
+        body += '<div class="stat-row">' + ''.join(matches['record']) + '</div>'
+        body += (
+            '<div class="match-columns">'
+            '<div><h4>📊 Últimos Partidos</h4>' + ''.join(matches['results']) + '</div>'
+            '<div><h4>📅 Próximos Partidos</h4>' + ''.join(matches['fixtures']) + '</div>'
+            '</div>'
+        )
+    return body
+
+
+def export_partition(partition, registry, version, badge_manifest, output, previous, force=False):
+    """Escribe las páginas de una partición; devuelve (entrada del índice, páginas reescritas)"""
+    model, scaler, spec = registry.get(version)
+    predictions, squad_cube, df_matches = load_partition(partition, model, scaler, spec.features)
+
+    partition_dir = Path(slugify(partition.competition)) / slugify(partition.season)
+    root = '../' * len(partition_dir.parts)
+    home_href = root + 'index.html'
+    templates = template_version()
+
+    pages = []
+    written = 0
+    for team in sorted(predictions['team'].unique()):
+        lineup, bench_players = select_best_11_by_formation(predictions, model, scaler, team)
+        next_match = get_next_match(df_matches, team, partition.team_aliases)
+        # Ruta relativa a la raíz del sitio (o URL externa si no hay escudo local)
+        badge_url = team_badge_url(team, partition.team_badges, badge_manifest, prefix=SITE_BADGE_DIR + '/')
+        squad = squad_cube.team_players(team)[SQUAD_TABLE_COLUMNS] if squad_cube is not None else None
+        matches = team_match_summary(df_matches, team, partition.team_aliases) if df_matches is not None else None
+
+        path = (partition_dir / f'{slugify(team)}.html').as_posix()
+        digest = fingerprint({
+            'templates': templates,
+            'model_version': version,
+            'team': team,
+            'badge': badge_url,
+            'next_match': next_match,
+            'lineup': lineup,
+            'bench': bench_players,
+            'squad': None if squad is None else squad.to_dict('records'),
+            'matches': matches
+        })
+
+        if force or previous.get(path) != digest or not (output / path).exists():
+            page_badge = root + badge_url if badge_url and badge_url.startswith(SITE_BADGE_DIR) else badge_url
+            header = team_header_html(team, next_match, True, page_badge)
+            squad_html = squad_table_html(squad, SQUAD_TABLE_LABELS) if squad is not None and len(squad) else ''
+            body = team_page_body(header, lineup, bench_players, squad_html, matches, home_href)
+
+            (output / path).parent.mkdir(parents=True, exist_ok=True)
+            (output / path).write_text(page_html(f'{team} - MatchLineup AI', body), encoding='utf-8')
+            written += 1
+
+        starters = [player['player_name'] for players in (lineup or {}).values() for player in players]
+        pages.append({
+            'team': team,
+            'path': path,
+            'hash': digest,
+            'badge': badge_url,
+            'next_match': next_match,
+            'starters': starters
+        })
+
+    entry = {
+        'key': partition.key,
+        'label': partition.label,
+        'model_version': model_version_label(spec),
+        'teams': pages
+    }
+    return entry, written
+
+
+def index_html(partitions):
+    body = '<h1 style="text-align: center;">MatchLineup AI</h1>'
+    for partition in partitions:
+        body += f'<h2>{html.escape(partition["label"])}</h2><div class="team-grid">'
+        for page in partition['teams']:
+            badge = f'<img src="{page["badge"]}" alt="" />' if page['badge'] else ''
+            body += f'<a class="team-link" href="{page["path"]}">{badge}{html.escape(page["team"])}</a>'
+        body += '</div>'
+    return page_html('MatchLineup AI', body)
+
+
+def export_site(output='site', partition_keys=None, model_version=None, force=False, data_dir=DATA_DIR):
+    """Exporta todas las particiones (o las de `partition_keys`); devuelve el índice"""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    previous = load_previous_index(output)
+    hashes = previous_hashes(previous)
+    copy_badges(output)
+    badge_manifest = badges.load_badge_manifest(badges.OUTPUT_DIR)
+    registry = ModelRegistry(MODELS_DIR, available_features=get_available_features())
+
+    exported = []
+    partitions = discover_partitions(data_dir)
+    check_db_path(len(partitions))
+    for partition in partitions:
+        if partition_keys and partition.key not in partition_keys:
+            continue
+        version = model_version or registry.default_version(partition.competition)
+        entry, written = export_partition(partition, registry, version, badge_manifest, output, hashes, force)
+        exported.append(entry)
+        print(f"{partition.label}: {written}/{len(entry['teams'])} páginas regeneradas")
+
+    partitions = merge_index(previous, exported, output)
+    index = {'generated_at': datetime.now().isoformat(timespec='seconds'), 'partitions': partitions}
+    (output / 'index.html').write_text(index_html(partitions), encoding='utf-8')
+    (output / INDEX_FILE).write_text(json.dumps(index, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta las páginas de los equipos a HTML estático")
+    parser.add_argument('--output', default='site', help="Carpeta de salida")
+    parser.add_argument('--partition', action='append', help="Clave 'competición/temporada' (repetible)")
+    parser.add_argument('--model-version', help="Versión del modelo (por defecto, la de cada competición)")
+    parser.add_argument('--force', action='store_true', help="Regenera todas las páginas")
+    args = parser.parse_args(argv)
+
+    export_site(args.output, args.partition, args.model_version, args.force)
+    print(f"✅ Sitio exportado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
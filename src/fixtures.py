@@ -0,0 +1,231 @@
+"""
+Contexto de calendario materializado por (equipo, partido).
+
+Para cada partido de cada equipo calcula, desde premier_matches.csv:
+días de descanso, partidos en los próximos 7/14 días, local/visitante y la
+forma del rival (puntos y diferencia de goles en sus últimos 5 partidos
+terminados antes de la fecha). Todo en una pasada vectorizada; al llegar
+resultados nuevos solo se sustituyen sus filas y se recalcula el estado de
+los equipos que los jugaron (ver FixtureContextStore).
+"""
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.history import add_match_ids
+
+FORM_WINDOW = 5
+SCHEDULED_STATUSES = ['TIMED', 'POSTPONED']
+
+CONTEXT_COLUMNS = [
+    'rest_days', 'matches_next_7d', 'matches_next_14d', 'is_home',
+    'opponent', 'opponent_form_points', 'opponent_form_gd'
+]
+
+
+def long_fixtures(df_matches):
+    """Una fila por (equipo, partido) con goles a favor/en contra y puntos"""
+    df_matches = add_match_ids(df_matches)
+
+    home = pd.DataFrame({
+        'match_id': df_matches['match_id'],
+        'date': df_matches['date'],
+        'status': df_matches['status'],
+        'team': df_matches['home_team_name'],
+        'opponent': df_matches['away_team_name'],
+        'is_home': 1,
+        'goals_for': df_matches['score_home'],
+        'goals_against': df_matches['score_away']
+    })
+    away = pd.DataFrame({
+        'match_id': df_matches['match_id'],
+        'date': df_matches['date'],
+        'status': df_matches['status'],
+        'team': df_matches['away_team_name'],
+        'opponent': df_matches['home_team_name'],
+        'is_home': 0,
+        'goals_for': df_matches['score_away'],
+        'goals_against': df_matches['score_home']
+    })
+    long = pd.concat([home, away], ignore_index=True)
+
+    finished = long['status'] == 'FINISHED'
+    goal_diff = long['goals_for'] - long['goals_against']
+    long['points'] = np.where(finished, np.select([goal_diff > 0, goal_diff == 0], [3, 1], 0), np.nan)
+    long['goal_diff'] = goal_diff.where(finished)
+
+    return long.sort_values(['team', 'date', 'match_id'], kind='mergesort').reset_index(drop=True)
+
+
+def team_form(long):
+    """Puntos y diferencia de goles acumulados en los últimos FORM_WINDOW partidos terminados"""
+    finished = long[long['status'] == 'FINISHED']
+    # Suma móvil por equipo como diferencia de sumas acumuladas (sin bucles por grupo)
+    cumulative = finished[['points', 'goal_diff']].groupby(finished['team'], sort=False).cumsum()
+    lagged = cumulative.groupby(finished['team'], sort=False).shift(FORM_WINDOW, fill_value=0)
+    window = cumulative - lagged
+    return pd.DataFrame({
+        'team': finished['team'],
+        'date': finished['date'],
+        'form_points': window['points'],
+        'form_gd': window['goal_diff']
+    }).sort_values('date', kind='mergesort')
+
+
+def schedule_context(long):
+    """
+    Descanso y congestión: dependen solo del calendario del propio equipo, así
+    que `long` debe traer completo el calendario de cada equipo que contenga.
+    """
+    long = long.copy()
+    # Clave (equipo, día) creciente -> conteos por búsqueda binaria en bloque
+    team_codes = long['team'].astype('category').cat.codes.to_numpy(dtype=np.int64)
+    days = (long['date'].to_numpy(dtype='datetime64[D]')).astype(np.int64)
+    keys = team_codes * 1_000_000 + days
+    long['matches_next_7d'] = np.searchsorted(keys, keys + 7, side='right') - np.searchsorted(keys, keys, side='right')
+    long['matches_next_14d'] = np.searchsorted(keys, keys + 14, side='right') - np.searchsorted(keys, keys, side='right')
+
+    previous = long.groupby('team', sort=False)['date'].shift(1)
+    long['rest_days'] = (long['date'] - previous).dt.days
+    return long
+
+
+def opponent_context(long, form):
+    """Forma del rival antes de la fecha del partido (sin incluir ese día)"""
+    long = long.drop(columns=['opponent_form_points', 'opponent_form_gd'], errors='ignore')
+    context = pd.merge_asof(
+        long.sort_values('date', kind='mergesort'),
+        form.rename(columns={'team': 'opponent'}),
+        on='date',
+        by='opponent',
+        allow_exact_matches=False
+    )
+    context['opponent_form_points'] = context.pop('form_points').fillna(0)
+    context['opponent_form_gd'] = context.pop('form_gd').fillna(0)
+    return context
+
+
+def _sorted(table):
+    return table.sort_values(['team', 'date', 'match_id'], kind='mergesort').reset_index(drop=True)
+
+
+def build_fixture_context(df_matches):
+    """Tabla de contexto por (team, match_id) en una pasada vectorizada"""
+    long = schedule_context(long_fixtures(df_matches))
+    return _sorted(opponent_context(long, team_form(long)))
+
+
+def match_fingerprints(df_matches):
+    """Huella por partido (estado y marcador) para detectar cambios"""
+    df_matches = add_match_ids(df_matches)
+    fingerprint = (
+        df_matches['status'].astype(str) + '|' + df_matches['utcDate'].astype(str) + '|'
+        + df_matches['score_home'].astype(str) + '|' + df_matches['score_away'].astype(str)
+    )
+    return pd.Series(fingerprint.to_numpy(), index=df_matches['match_id'].to_numpy())
+
+
+class FixtureContextStore:
+    """
+    Tabla de contexto materializada con su estado por equipo (forma en
+    ventana móvil). Al llegar resultados solo se sustituyen las filas de los
+    partidos nuevos o modificados y se recalcula:
+      - descanso y congestión de los equipos que jugaron esos partidos;
+      - su forma;
+      - la forma del rival en las filas cuyo rival es uno de esos equipos.
+    El resto de filas no depende de ellos y se conserva tal cual.
+    """
+
+    # Cambia si cambia el formato guardado: una caché de otra versión se descarta
+    CACHE_VERSION = 2
+
+    def __init__(self, table=None, form=None, fingerprints=None):
+        self.table = table
+        self.form = form
+        self.fingerprints = fingerprints if fingerprints is not None else pd.Series(dtype=object)
+
+    def update(self, df_matches):
+        """Aplica solo los partidos nuevos, modificados o eliminados desde la última llamada"""
+        fingerprints = match_fingerprints(df_matches)
+
+        if self.table is None or self.form is None:
+            long = schedule_context(long_fixtures(df_matches))
+            self.form = team_form(long)
+            self.table = _sorted(opponent_context(long, self.form))
+            self.fingerprints = fingerprints
+            return self.table
+
+        previous = self.fingerprints.reindex(fingerprints.index)
+        changed_ids = fingerprints.index[previous.to_numpy() != fingerprints.to_numpy()]
+        removed_ids = self.fingerprints.index.difference(fingerprints.index)
+
+        if len(changed_ids) == 0 and len(removed_ids) == 0:
+            return self.table
+
+        matches = df_matches[add_match_ids(df_matches)['match_id'].isin(changed_ids).to_numpy()]
+        incoming = long_fixtures(matches)
+        outgoing = self.table['match_id'].isin(changed_ids.union(removed_ids))
+        affected = set(incoming['team']) | set(self.table.loc[outgoing, 'team'])
+
+        table = pd.concat([self.table[~outgoing], incoming], ignore_index=True)
+        table = table.sort_values(['team', 'date', 'match_id'], kind='mergesort')
+
+        # Estado por equipo: calendario y forma de los equipos afectados
+        own = table['team'].isin(affected)
+        refreshed = schedule_context(table[own])
+        self.form = pd.concat(
+            [self.form[~self.form['team'].isin(affected)], team_form(refreshed)], ignore_index=True
+        ).sort_values('date', kind='mergesort')
+
+        # Filas cuyo contexto puede haber cambiado: las propias y las que tienen de rival a un afectado
+        rival = table['opponent'].isin(affected) & ~own
+        refreshed = pd.concat([refreshed, table[rival]])
+        refreshed = opponent_context(refreshed, self.form)
+
+        table = pd.concat([table[~(own | rival)], refreshed], ignore_index=True)
+        # Las filas nuevas llegan sin conteos (NaN): se vuelven a enteros como en la tabla completa
+        self.table = _sorted(table.astype({'matches_next_7d': 'int64', 'matches_next_14d': 'int64'}))
+        self.fingerprints = fingerprints
+        return self.table
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle({
+            'version': self.CACHE_VERSION,
+            'table': self.table,
+            'form': self.form,
+            'fingerprints': self.fingerprints
+        }, path)
+
+    @classmethod
+    def load(cls, path):
+        """Abre la tabla guardada; si no existe, es de otra versión o está dañada, empieza vacía"""
+        try:
+            stored = pd.read_pickle(path)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # Archivo truncado o escrito con clases que ya no existen
+            return cls()
+
+        if not isinstance(stored, dict) or stored.get('version') != cls.CACHE_VERSION:
+            return cls()
+        return cls(stored['table'], stored['form'], stored['fingerprints'])
+
+
+def next_fixture_context(table, today=None):
+    """Contexto del próximo partido programado de cada equipo (una fila por equipo)"""
+    scheduled = table[table['status'].isin(SCHEDULED_STATUSES)]
+    if today is not None:
+        scheduled = scheduled[scheduled['date'] >= pd.Timestamp(today).normalize()]
+    return scheduled.sort_values(['team', 'date'], kind='mergesort').groupby('team', sort=False).head(1)
+
+
+def attach_fixture_context(df, next_fixtures):
+    """Une a cada fila de la plantilla el contexto del próximo partido de su equipo"""
+    columns = ['team', 'match_id'] + CONTEXT_COLUMNS
+    df = df.drop(columns=[c for c in columns if c != 'team' and c in df.columns])
+    return df.merge(next_fixtures[columns], on='team', how='left')
@@ -0,0 +1,222 @@
+"""
+Histórico de apariciones indexado por (jugador, fecha).
+
+Admite dos esquemas de historico.csv:
+  - Legado: sin partido ni fecha; el orden de las filas es la cronología.
+  - Por partido: columnas `match_id` y/o `date` (más `team`), unidas a
+    premier_matches.csv para completar la que falte.
+
+El histórico se ordena una sola vez, así que las ventanas móviles siguen
+siendo correctas aunque el archivo se amplíe desordenado, y las consultas
+por jugador, partido o rango de fechas son búsquedas binarias.
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def add_match_ids(df_matches):
+    """Añade `match_id` y `date` a los partidos si no los traen"""
+    df_matches = df_matches.copy()
+    df_matches['date'] = pd.to_datetime(df_matches['utcDate']).dt.normalize()
+    if 'match_id' not in df_matches.columns:
+        df_matches['match_id'] = (
+            df_matches['date'].dt.strftime('%Y%m%d') + '-'
+            + df_matches['home_team_name'] + '-' + df_matches['away_team_name']
+        )
+    return df_matches
+
+
+def team_fixtures(df_matches):
+    """Partidos en formato largo: una fila por (match_id, equipo)"""
+    df_matches = add_match_ids(df_matches)
+    home = df_matches[['match_id', 'date', 'home_team_name']].rename(columns={'home_team_name': 'team'})
+    away = df_matches[['match_id', 'date', 'away_team_name']].rename(columns={'away_team_name': 'team'})
+    return pd.concat([home, away], ignore_index=True)
+
+
+def prepare_history(df_historico, df_matches=None):
+    """Normaliza el esquema del histórico y lo ordena por (jugador, fecha, fila)"""
+    df_hist = df_historico.copy()
+    # Orden de llegada: desempata apariciones sin fecha o del mismo día
+    df_hist['_seq'] = np.arange(len(df_hist))
+
+    has_match = 'match_id' in df_hist.columns
+    has_date = 'date' in df_hist.columns
+
+    if df_matches is not None and (has_match or has_date) and not (has_match and has_date):
+        fixtures = team_fixtures(df_matches)
+        if has_match:
+            df_hist = df_hist.merge(
+                fixtures[['match_id', 'team', 'date']], on=['match_id', 'team'], how='left'
+            )
+        else:
+            df_hist['date'] = pd.to_datetime(df_hist['date']).dt.normalize()
+            df_hist = df_hist.merge(
+                fixtures[['team', 'date', 'match_id']], on=['team', 'date'], how='left'
+            )
+
+    if 'date' not in df_hist.columns:
+        df_hist['date'] = pd.NaT
+    df_hist['date'] = pd.to_datetime(df_hist['date'])
+    if 'match_id' not in df_hist.columns:
+        df_hist['match_id'] = None
+
+    df_hist = df_hist.sort_values(['id_player', 'date', '_seq'], na_position='first')
+    return df_hist.reset_index(drop=True)
+
+
+class HistoryIndex:
+    """Histórico ordenado por (jugador, fecha) con búsquedas O(log n)"""
+
+    def __init__(self, df_historico, df_matches=None):
+        self.df = prepare_history(df_historico, df_matches)
+
+        self._players = self.df['id_player'].to_numpy()
+        # NaT -> mínimo int64, así que se ordena igual que na_position='first'
+        self._dates = self.df['date'].to_numpy(dtype='datetime64[ns]').view('int64')
+
+        match_ids = self.df['match_id'].astype(str).to_numpy()
+        self._match_order = np.argsort(match_ids, kind='stable')
+        self._match_keys = match_ids[self._match_order]
+
+    @property
+    def dates(self):
+        """Fechas del histórico ordenado como int64 (ns); las ausentes son el mínimo de int64"""
+        return self._dates
+
+    @property
+    def has_dates(self):
+        return bool(self.df['date'].notna().any())
+
+    def player_bounds(self, id_player):
+        """Rango [inicio, fin) de las filas del jugador en el histórico ordenado"""
+        start = np.searchsorted(self._players, id_player, side='left')
+        end = np.searchsorted(self._players, id_player, side='right')
+        return int(start), int(end)
+
+    def player_rows(self, id_player, start_date=None, end_date=None):
+        """Apariciones de un jugador en orden cronológico, opcionalmente acotadas por fecha"""
+        lower, upper = self.player_bounds(id_player)
+        dates = self._dates[lower:upper]
+        start, end = lower, upper
+        if start_date is not None:
+            start = lower + int(np.searchsorted(dates, pd.Timestamp(start_date).value, side='left'))
+        if end_date is not None:
+            end = lower + int(np.searchsorted(dates, pd.Timestamp(end_date).value, side='right'))
+        return self.df.iloc[start:end]
+
+    def match_lineup(self, match_id, team=None):
+        """Jugadores que aparecieron en un partido (opcionalmente de un equipo)"""
+        start = np.searchsorted(self._match_keys, str(match_id), side='left')
+        end = np.searchsorted(self._match_keys, str(match_id), side='right')
+        rows = self.df.iloc[np.sort(self._match_order[start:end])]
+        if team is not None:
+            rows = rows[rows['team'] == team]
+        return rows
+
+    def last_n_mean(self, column, n):
+        """Media de las últimas `n` apariciones de cada jugador"""
+        values = self.df[['id_player', column]].copy()
+        values[column] = values[column].fillna(0)
+        return values.groupby('id_player').tail(n).groupby('id_player')[column].mean()
+
+
+class PlayerHistoryCSR:
+    """
+    Histórico por jugador en formato CSR: arrays NumPy contiguos ordenados por
+    jugador y una tabla de offsets, de modo que las apariciones del jugador i
+    son `columna[offsets[i]:offsets[i + 1]]`. Se puede guardar en disco y
+    abrir con memory-map.
+    """
+
+    COLUMNS = ('minutesPlayed', 'date', 'market_value', 'age')
+
+    def __init__(self, player_ids, offsets, columns, meta=None):
+        self.player_ids = player_ids
+        self.offsets = offsets
+        self.columns = columns
+        self.meta = meta or {}
+        self._position = {player_id: i for i, player_id in enumerate(player_ids.tolist())}
+
+    @classmethod
+    def from_index(cls, history_index, meta=None):
+        """Construye los arrays a partir del histórico ya ordenado por jugador"""
+        df = history_index.df
+        players = df['id_player'].to_numpy()
+
+        if len(players):
+            starts = np.flatnonzero(np.r_[True, players[1:] != players[:-1]])
+        else:
+            starts = np.array([], dtype=np.int64)
+        offsets = np.append(starts, len(players)).astype(np.int64)
+
+        columns = {
+            'minutesPlayed': df['minutesPlayed'].fillna(0).to_numpy(dtype=np.float32),
+            'date': history_index.dates.copy(),
+            'market_value': df['market_value'].to_numpy(dtype=np.float64),
+            'age': df['age'].to_numpy(dtype=np.float32)
+        }
+        return cls(players[starts].astype(np.int64), offsets, columns, meta)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def __contains__(self, id_player):
+        return id_player in self._position
+
+    def player(self, id_player):
+        """Columnas del jugador como vistas de los arrays (O(1)); None si no hay histórico"""
+        i = self._position.get(id_player)
+        if i is None:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {name: values[start:end] for name, values in self.columns.items()}
+
+    def save(self, directory):
+        """
+        Escribe los arrays en un directorio temporal y lo pone en su sitio con
+        os.replace: un lector nunca ve un índice a medio escribir.
+        """
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f'.{directory.name}-', dir=directory.parent))
+        # mkdtemp crea el directorio con permisos 0700
+        os.chmod(tmp, 0o755)
+        try:
+            np.save(tmp / 'player_ids.npy', self.player_ids)
+            np.save(tmp / 'offsets.npy', self.offsets)
+            for name, values in self.columns.items():
+                np.save(tmp / f'{name}.npy', values)
+            (tmp / 'meta.json').write_text(json.dumps(self.meta))
+
+            # os.replace no sustituye un directorio con contenido: el anterior se aparta primero.
+            # Los lectores con memory-map abierto conservan sus archivos hasta cerrarlos.
+            old = None
+            if directory.exists():
+                old = Path(tempfile.mkdtemp(prefix=f'.{directory.name}-old-', dir=directory.parent))
+                os.replace(directory, old / directory.name)
+            os.replace(tmp, directory)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Abre un índice guardado; con `mmap` los arrays se leen bajo demanda"""
+        directory = Path(directory)
+        mode = 'r' if mmap else None
+        columns = {name: np.load(directory / f'{name}.npy', mmap_mode=mode) for name in cls.COLUMNS}
+        return cls(
+            np.load(directory / 'player_ids.npy'),
+            np.load(directory / 'offsets.npy', mmap_mode=mode),
+            columns,
+            json.loads((directory / 'meta.json').read_text())
+        )
@@ -0,0 +1,96 @@
+"""
+Imputación de features para jugadores sin histórico o con datos incompletos.
+
+En lugar de constantes (45 minutos, 25 años, valor 0) se usan medianas
+condicionadas, ajustadas una vez sobre historico.csv (último estado de cada
+jugador) y guardadas en tablas pequeñas por nivel de detalle:
+    market_value:      (equipo, posición) -> (posición) -> global
+    age:               (equipo, posición) -> (posición) -> global
+    player_last_3_avg: (equipo, posición, nivel de mercado) -> (posición, nivel) -> (posición) -> global
+Un grupo solo se usa si tiene al menos MIN_GROUP_SIZE jugadores. Aplicarlo
+es un reindex vectorizado por nivel sobre las filas incompletas.
+"""
+import numpy as np
+import pandas as pd
+
+# Mismos cortes que market_tier en create_features
+MARKET_TIER_BINS = [0, 1e6, 5e6, 15e6, 30e6, np.inf]
+MIN_GROUP_SIZE = 5
+
+# Orden de imputación: el nivel de mercado usa market_value ya imputado
+LEVELS = {
+    'market_value': [['team', 'position'], ['position']],
+    'age': [['team', 'position'], ['position']],
+    'player_last_3_avg': [['team', 'position', 'market_tier'], ['position', 'market_tier'], ['position']]
+}
+
+# Si el histórico no tiene ningún valor conocido
+FALLBACKS = {'market_value': 0, 'age': 25, 'player_last_3_avg': 45.0}
+
+
+def market_tier(market_value):
+    return pd.cut(market_value, bins=MARKET_TIER_BINS, labels=False)
+
+
+def _lookup(medians, frame, keys):
+    if len(keys) == 1:
+        return medians.reindex(frame[keys[0]]).to_numpy()
+    return medians.reindex(pd.MultiIndex.from_frame(frame[keys])).to_numpy()
+
+
+class Imputer:
+    """Medianas condicionadas por nivel para cada columna imputable"""
+
+    def __init__(self, tables, global_medians):
+        self.tables = tables
+        self.global_medians = global_medians
+
+    @classmethod
+    def fit(cls, players, min_group_size=MIN_GROUP_SIZE):
+        """`players`: una fila por jugador con team, position, market_value, age y player_last_3_avg"""
+        players = players.copy()
+        # El esquema rellena con 0 los valores de mercado ausentes: no son valores reales
+        players['market_value'] = players['market_value'].replace(0, np.nan)
+        players['market_tier'] = market_tier(players['market_value'])
+
+        tables = {}
+        global_medians = {}
+        for column, levels in LEVELS.items():
+            known = players[players[column].notna()]
+            tables[column] = []
+            for keys in levels:
+                grouped = known.groupby(keys)[column].agg(['median', 'size'])
+                tables[column].append((keys, grouped.loc[grouped['size'] >= min_group_size, 'median']))
+
+            median = known[column].median()
+            global_medians[column] = FALLBACKS[column] if pd.isna(median) else float(median)
+
+        return cls(tables, global_medians)
+
+    def transform(self, df, columns=None):
+        """Rellena los valores ausentes de `columns` (todas por defecto) en una pasada por nivel"""
+        df = df.copy()
+        for column in LEVELS:
+            if columns is not None and column not in columns:
+                continue
+            if column not in df.columns:
+                df[column] = np.nan
+
+            missing = df[column].isna()
+            if not missing.any():
+                continue
+
+            frame = df.loc[missing]
+            if 'market_value' in frame.columns:
+                frame = frame.assign(market_tier=market_tier(frame['market_value']))
+
+            filled = pd.Series(np.nan, index=frame.index)
+            for keys, medians in self.tables[column]:
+                pending = filled.isna()
+                if not pending.any() or not all(key in frame.columns for key in keys):
+                    continue
+                filled[pending] = _lookup(medians, frame.loc[pending], keys)
+
+            df.loc[missing, column] = filled.fillna(self.global_medians[column]).to_numpy()
+
+        return df
@@ -0,0 +1,209 @@
+"""
+Prueba de carga en proceso para app.py con sesiones concurrentes.
+
+Cada sesión es un AppTest de Streamlit (sin navegador) que ejecuta el script
+igual que el servidor: todas las sesiones comparten proceso, GIL y cachés,
+como ocurre con varios usuarios conectados al mismo worker.
+
+Uso:
+    python -m src.loadtest --sessions 1 2 4 8 16 --actions 20 --output capacidad.csv
+
+CPU y RSS se miden para el proceso entero (no por sesión): las columnas
+`*_process` son totales del nivel y las `*_avg` esos totales divididos
+entre sesiones o interacciones, no mediciones de cada sesión.
+"""
+import argparse
+import csv
+import json
+import random
+import resource
+import threading
+import time
+from pathlib import Path
+
+# Pesos de las acciones de un usuario típico. Las pestañas de st.tabs se
+# cambian en el navegador sin rerun, así que el coste en servidor lo generan
+# los cambios de equipo y los reruns por interacción con la página.
+ACTION_WEIGHTS = {
+    'switch_team': 0.6,
+    'rerun': 0.4
+}
+
+
+def current_rss_mb():
+    """RSS actual del proceso en MB (Linux); si no, el pico de getrusage"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Pico de RSS del proceso en MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def percentile(values, q):
+    """Percentil q (0-100) por interpolación lineal"""
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def new_session(app_path, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(app_path), default_timeout=timeout)
+    t0 = time.perf_counter()
+    at.run()
+    return at, time.perf_counter() - t0
+
+
+def run_session(app_path, actions, think_time, timeout, seed, latencies, errors):
+    """Simula una sesión: carga inicial y `actions` interacciones aleatorias"""
+    rng = random.Random(seed)
+    try:
+        at, elapsed = new_session(app_path, timeout)
+        latencies.append(('initial', elapsed))
+
+        teams = list(at.selectbox(key='team').options)
+
+        for _ in range(actions):
+            if think_time > 0:
+                time.sleep(rng.expovariate(1 / think_time))
+
+            action = rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+            t0 = time.perf_counter()
+            if action == 'switch_team':
+                at.selectbox(key='team').set_value(rng.choice(teams)).run()
+            else:
+                at.run()
+            latencies.append((action, time.perf_counter() - t0))
+
+            if at.exception:
+                errors.append(str(at.exception[0].message))
+    except Exception as exc:
+        errors.append(repr(exc))
+
+
+def run_level(app_path, sessions, actions, think_time, timeout, seed):
+    """Lanza `sessions` sesiones concurrentes y devuelve las métricas del nivel"""
+    latencies = []
+    errors = []
+
+    rss_before = current_rss_mb()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(app_path, actions, think_time, timeout, seed + i, latencies, errors),
+            name=f"session-{i}"
+        )
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = current_rss_mb()
+
+    reruns = [elapsed for action, elapsed in latencies if action != 'initial']
+    initial = [elapsed for action, elapsed in latencies if action == 'initial']
+
+    return {
+        'sessions': sessions,
+        'reruns': len(reruns),
+        'errors': len(errors),
+        'p50_ms': percentile(reruns, 50) * 1e3,
+        'p95_ms': percentile(reruns, 95) * 1e3,
+        'p99_ms': percentile(reruns, 99) * 1e3,
+        'initial_p50_ms': percentile(initial, 50) * 1e3,
+        'throughput_rps': len(latencies) / wall if wall > 0 else 0.0,
+        # AppTest ejecuta cada script en un hilo propio, así que time.thread_time
+        # no ve su coste: CPU y RSS son del proceso entero, y las medias solo
+        # reparten esos totales (no son mediciones por sesión).
+        'cpu_s_process': cpu,
+        'cpu_s_process_per_session_avg': cpu / sessions,
+        'cpu_ms_process_per_action_avg': cpu / max(len(latencies), 1) * 1e3,
+        'rss_mb_process': rss_after,
+        'rss_mb_process_delta': rss_after - rss_before,
+        'rss_mb_process_delta_per_session_avg': max(rss_after - rss_before, 0.0) / sessions,
+        'peak_rss_mb': peak_rss_mb(),
+        'error_samples': errors[:3]
+    }
+
+
+def run_capacity_curve(app_path, levels, actions, think_time, timeout, seed=0):
+    """Ejecuta un nivel por cada número de sesiones y devuelve la curva de capacidad"""
+    # Sesión de calentamiento: llena las cachés de proceso (st.cache_*) para
+    # que el primer nivel no cargue con el arranque en frío.
+    new_session(app_path, timeout)
+
+    curve = []
+    for sessions in levels:
+        result = run_level(app_path, sessions, actions, think_time, timeout, seed)
+        curve.append(result)
+        print(
+            f"{sessions:>4} sesiones | p50 {result['p50_ms']:8.1f} ms | "
+            f"p95 {result['p95_ms']:8.1f} ms | p99 {result['p99_ms']:8.1f} ms | "
+            f"CPU proceso {result['cpu_s_process']:6.2f} s | "
+            f"ΔRSS proceso {result['rss_mb_process_delta']:6.1f} MB | errores {result['errors']}"
+        )
+    return curve
+
+
+def write_curve(curve, output):
+    output = Path(output)
+    if output.suffix == '.json':
+        output.write_text(json.dumps(curve, indent=2))
+        return
+
+    fields = [key for key in curve[0] if key != 'error_samples']
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(curve)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones concurrentes de app.py")
+    parser.add_argument('--app', default='app.py', help="Script de Streamlit a probar")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="Niveles de sesiones concurrentes")
+    parser.add_argument('--actions', type=int, default=20, help="Interacciones por sesión")
+    parser.add_argument('--think-time', type=float, default=0.5,
+                        help="Tiempo medio (s) entre interacciones de un usuario")
+    parser.add_argument('--timeout', type=float, default=120, help="Timeout por rerun (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Guarda la curva en .csv o .json")
+    args = parser.parse_args(argv)
+
+    # AppTest resuelve las rutas relativas respecto a este módulo, no al directorio actual
+    app_path = Path(args.app).resolve()
+    curve = run_capacity_curve(app_path, args.sessions, args.actions, args.think_time, args.timeout, args.seed)
+    print("CPU y RSS son del proceso entero; las columnas *_avg los reparten entre sesiones o interacciones")
+
+    if args.output:
+        write_curve(curve, args.output)
+        print(f"Curva de capacidad guardada en {args.output}")
+
+    errors = [sample for level in curve for sample in level['error_samples']]
+    if errors:
+        print("Ejemplos de errores:")
+        for sample in errors:
+            print(f"  - {sample}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Registro de modelos versionados con carga diferida y expulsión LRU.
+
+Estructura en disco:
+    models/xgboost_model.pkl + models/scaler.pkl   <- versión "default" (legado)
+    models/<versión>/manifest.json                  <- una carpeta por versión
+
+manifest.json:
+    {"version": "2026-01-xgb", "model": "model.pkl", "scaler": "scaler.pkl",
+     "features": [...], "metrics": {"auc": 0.87}, "competitions": ["Premier League"],
+     "created_at": "2026-01-15"}
+
+Los modelos se cargan al usarse por primera vez y se descartan los menos
+usados cuando el tamaño en memoria de los cargados supera el presupuesto.
+Las versiones cuyo manifest pide features que la app no calcula se
+descartan al descubrirlas (ver `rejected`).
+"""
+import json
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+DEFAULT_VERSION = 'default'
+MANIFEST_FILE = 'manifest.json'
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    version: str
+    model_path: Path
+    scaler_path: Path
+    features: tuple = None  # None -> features por defecto de la app
+    metrics: dict = field(default_factory=dict, compare=False, hash=False)
+    competitions: tuple = ()
+    created_at: str = ''
+
+
+def memory_bytes(obj, _seen=None):
+    """
+    Tamaño aproximado en memoria de un objeto cargado: arrays NumPy por su
+    buffer, boosters de XGBoost por su modelo serializado (la memoria nativa
+    no la ve sys.getsizeof) y el resto recorriendo atributos y contenedores.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, 'save_raw'):
+        return len(obj.save_raw())
+    if hasattr(obj, 'get_booster'):
+        return memory_bytes(obj.get_booster(), seen) + memory_bytes(vars(obj), seen)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(memory_bytes(key, seen) + memory_bytes(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(memory_bytes(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += memory_bytes(vars(obj), seen)
+    return size
+
+
+def _spec_from_manifest(directory):
+    manifest = json.loads((directory / MANIFEST_FILE).read_text())
+    features = manifest.get('features')
+    return ModelSpec(
+        version=str(manifest.get('version', directory.name)),
+        model_path=directory / manifest.get('model', 'model.pkl'),
+        scaler_path=directory / manifest.get('scaler', 'scaler.pkl'),
+        features=tuple(features) if features else None,
+        metrics=manifest.get('metrics', {}),
+        competitions=tuple(manifest.get('competitions', ())),
+        created_at=str(manifest.get('created_at', ''))
+    )
+
+
+def discover_models(models_dir='models'):
+    """Versiones disponibles (solo lee los manifest, no los modelos)"""
+    models_dir = Path(models_dir)
+    specs = {}
+
+    legacy_model = models_dir / 'xgboost_model.pkl'
+    if legacy_model.exists():
+        specs[DEFAULT_VERSION] = ModelSpec(DEFAULT_VERSION, legacy_model, models_dir / 'scaler.pkl')
+
+    if models_dir.exists():
+        for directory in sorted(p for p in models_dir.iterdir() if (p / MANIFEST_FILE).exists()):
+            try:
+                spec = _spec_from_manifest(directory)
+            except (OSError, ValueError):
+                continue
+            specs[spec.version] = spec
+
+    return specs
+
+
+class ModelRegistry:
+    """
+    Carga diferida de (modelo, scaler) por versión con un presupuesto de memoria LRU.
+    `available_features`: columnas que produce la app; si se pasa, las versiones
+    que piden otras quedan en `rejected` (versión -> features que faltan).
+    """
+
+    def __init__(self, models_dir='models', memory_budget_mb=512, available_features=None):
+        self.models_dir = Path(models_dir)
+        self.memory_budget = memory_budget_mb * 1e6
+        self.specs = discover_models(self.models_dir)
+        self.rejected = {}
+        if available_features is not None:
+            available = set(available_features)
+            for version, spec in list(self.specs.items()):
+                missing = sorted(set(spec.features or ()) - available)
+                if missing:
+                    self.rejected[version] = missing
+                    del self.specs[version]
+        self._loaded = OrderedDict()
+        self._sizes = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def versions(self):
+        """Versiones ordenadas de la más reciente a la más antigua"""
+        return sorted(self.specs, key=lambda v: (self.specs[v].created_at, v), reverse=True)
+
+    def default_version(self, competition=None):
+        """Versión más reciente para la competición (o la general si no hay una específica)"""
+        versions = self.versions()
+        if competition is not None:
+            for version in versions:
+                if competition in self.specs[version].competitions:
+                    return version
+        general = [v for v in versions if not self.specs[v].competitions]
+        return (general or versions or [None])[0]
+
+    def loaded_versions(self):
+        with self._lock:
+            return list(self._loaded)
+
+    def get(self, version):
+        """
+        (modelo, scaler, spec) de una versión; la carga si hace falta. La carga
+        ocurre fuera del lock: las versiones ya cargadas se sirven mientras
+        tanto y quien pida la misma versión espera a su future.
+        """
+        spec = self.specs[version]
+        with self._lock:
+            if version in self._loaded:
+                self._loaded.move_to_end(version)
+                return self._loaded[version] + (spec,)
+
+            future = self._loading.get(version)
+            owner = future is None
+            if owner:
+                future = self._loading[version] = Future()
+
+        if owner:
+            try:
+                loaded = self._load(spec)
+            except BaseException as exc:
+                with self._lock:
+                    del self._loading[version]
+                future.set_exception(exc)
+                raise
+
+            size = memory_bytes(loaded)
+            with self._lock:
+                del self._loading[version]
+                self._loaded[version] = loaded
+                self._sizes[version] = size
+                self._evict(keep=version)
+            future.set_result(loaded)
+
+        model, scaler = future.result()
+        return model, scaler, spec
+
+    @staticmethod
+    def _load(spec):
+        model = joblib.load(spec.model_path)
+        scaler = joblib.load(spec.scaler_path)
+
+        if spec.features is not None:
+            # El scaler recuerda las columnas (y su orden) con que se entrenó
+            names = getattr(scaler, 'feature_names_in_', None)
+            expected = list(names) if names is not None else getattr(scaler, 'n_features_in_', None)
+            declared = list(spec.features) if names is not None else len(spec.features)
+            if expected is not None and expected != declared:
+                raise ValueError(
+                    f"Las features del manifest de {spec.version} no coinciden con las del scaler: "
+                    f"{declared} != {expected}"
+                )
+        return model, scaler
+
+    def _evict(self, keep):
+        used = sum(self._sizes[v] for v in self._loaded)
+        for version in list(self._loaded):
+            if used <= self.memory_budget:
+                break
+            if version == keep:
+                continue
+            used -= self._sizes.pop(version)
+            del self._loaded[version]
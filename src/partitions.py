@@ -0,0 +1,91 @@
+"""
+Particiones de datos por competición y temporada.
+
+Estructura en disco:
+    data/                              <- partición por defecto (la actual)
+    data/<competición>/<temporada>/    <- una carpeta por partición
+
+Cada partición contiene los mismos CSV que data/ y, opcionalmente, un
+`partition.json` con metadatos:
+    {"competition": "Premier League", "season": "2024-25",
+     "team_aliases": {"Arsenal FC": "Arsenal"}, "team_badges": {...}}
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_COMPETITION = 'Premier League'
+DEFAULT_SEASON = '2025-26'
+MARKER_FILE = 'convocatoria_siguiente.csv'
+META_FILE = 'partition.json'
+# Carpetas de data/ que no son competiciones (cachés derivadas de la partición por defecto)
+RESERVED_DIRS = {'cache'}
+
+
+@dataclass(frozen=True)
+class Partition:
+    competition: str
+    season: str
+    path: str
+    team_aliases: dict = field(default_factory=dict, compare=False, hash=False)
+    team_badges: dict = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def key(self):
+        return f'{self.competition}/{self.season}'
+
+    @property
+    def label(self):
+        return f'{self.competition} {self.season}'
+
+
+def _read_meta(directory):
+    try:
+        return json.loads((Path(directory) / META_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _partition(directory, competition, season):
+    meta = _read_meta(directory)
+    return Partition(
+        competition=meta.get('competition', competition),
+        season=str(meta.get('season', season)),
+        path=str(directory),
+        team_aliases=meta.get('team_aliases', {}),
+        team_badges=meta.get('team_badges', {})
+    )
+
+
+def discover_partitions(data_dir='data'):
+    """
+    Lista las particiones disponibles sin leer sus datos (solo el árbol de
+    carpetas y los partition.json), ordenadas por competición y temporada
+    más reciente primero.
+    """
+    data_dir = Path(data_dir)
+    partitions = []
+
+    if (data_dir / MARKER_FILE).exists():
+        partitions.append(_partition(data_dir, DEFAULT_COMPETITION, DEFAULT_SEASON))
+
+    competition_dirs = sorted(
+        p for p in data_dir.iterdir()
+        if p.is_dir() and p.name not in RESERVED_DIRS and not p.name.startswith('.')
+    ) if data_dir.exists() else []
+    for competition_dir in competition_dirs:
+        for season_dir in sorted(p for p in competition_dir.iterdir() if p.is_dir()):
+            if (season_dir / MARKER_FILE).exists():
+                partitions.append(_partition(season_dir, competition_dir.name, season_dir.name))
+
+    # Una carpeta explícita gana a la partición por defecto con la misma clave
+    unique = {}
+    for partition in partitions:
+        unique[partition.key] = partition
+    return sorted(unique.values(), key=lambda p: (p.competition, _season_sort_key(p.season)))
+
+
+def _season_sort_key(season):
+    # "2025-26" antes que "2024-25"
+    digits = ''.join(ch for ch in season if ch.isdigit())
+    return -int(digits[:4]) if digits else 0
@@ -0,0 +1,241 @@
+"""
+Cálculo de features y predicciones de las plantillas, sin dependencias de Streamlit.
+
+app.py lo envuelve en sus loaders cacheados y `python -m src.export` lo usa
+directamente para generar el sitio estático.
+"""
+import numpy as np
+import pandas as pd
+
+from src.explain import feature_contributions, top_contributions
+from src.imputation import MARKET_TIER_BINS, Imputer
+
+
+def calculate_temporal_features_from_history(history_index):
+    """
+    Calcula SOLO player_last_3_avg desde el histórico ordenado por (jugador, fecha)
+    """
+    # Media de los últimos 3 partidos (equivale al último valor del rolling(3, min_periods=1))
+    last_3_avg = history_index.last_n_mean('minutesPlayed', 3)
+
+    features_temporales = last_3_avg.rename('player_last_3_avg').reset_index()
+
+    return features_temporales
+
+
+def create_features(df, batch_stats=None):
+    """
+    `batch_stats` (src/streaming.py) aporta las medias y frecuencias del
+    archivo completo cuando `df` es solo un bloque de él.
+    """
+    df = df.copy()
+    
+    required = {
+        'market_value': 0, 'age': 25, 'captain': 0,
+        'player_last_3_avg': 45.0, 'country_': 'Unknown',
+        'position': 'M', 'team': 'Unknown'
+    }
+    for col, default in required.items():
+        if col not in df.columns:
+            df[col] = default
+        df[col] = df[col].fillna(default)
+    
+    df['market_value_log'] = np.log1p(df['market_value'])
+    
+    peak_age = 26
+    df['value_age_decay'] = df['market_value'] * np.exp(-0.05 * np.abs(df['age'] - peak_age))
+    
+    df['captain_x_market'] = df['captain'] * df['market_value_log']
+    
+    position_rank = {'G': 1, 'D': 2, 'M': 3, 'F': 4}
+    df['position_rank'] = df['position'].map(position_rank).fillna(3)
+    df['position_x_age'] = df['position_rank'] * df['age']
+    
+    df['player_convocations'] = np.maximum(df['age'] - 16, 0)
+    
+    if batch_stats is None:
+        team_avg = df.groupby('team')['market_value'].transform('mean')
+        country_freq = df['country_'].map(df['country_'].value_counts(normalize=True))
+        team_freq = df['team'].map(df['team'].value_counts(normalize=True))
+    else:
+        team_avg, country_freq, team_freq = batch_stats.lookup(df)
+
+    df['team_avg_market_value'] = team_avg
+    df['player_value_vs_team'] = df['market_value'] / (team_avg + 1)
+    
+    df['pos_D'] = (df['position'] == 'D').astype(int)
+    df['pos_F'] = (df['position'] == 'F').astype(int)
+    df['pos_G'] = (df['position'] == 'G').astype(int)
+    df['pos_M'] = (df['position'] == 'M').astype(int)
+    
+    df['country_frequency'] = country_freq.fillna(0.01)
+    df['team_frequency'] = team_freq.fillna(0.05)
+    
+    df['age_group'] = pd.cut(
+        df['age'], bins=[0, 21, 25, 29, 33, 50], labels=[0, 1, 2, 3, 4]
+    )
+    df['age_group_encoded'] = df['age_group'].fillna(1).astype(int)
+    
+    df['market_tier'] = pd.cut(
+        df['market_value'], bins=MARKET_TIER_BINS, labels=[0, 1, 2, 3, 4]
+    )
+    df['market_tier_encoded'] = df['market_tier'].fillna(1).astype(int)
+    
+    df = df.replace([np.inf, -np.inf], 0)
+    df = df.fillna(0)
+    
+    return df
+
+
+def get_feature_columns():
+    return [
+        'market_value_log',
+        'value_age_decay',
+        'captain_x_market',
+        'position_x_age',
+        'player_convocations',
+        'player_last_3_avg',
+        'team_avg_market_value',
+        'player_value_vs_team',
+        'pos_D',
+        'pos_F',
+        'pos_G',
+        'pos_M',
+        'country_frequency',
+        'team_frequency',
+        'age_group_encoded',
+        'market_tier_encoded'
+    ]
+
+
+def get_available_features():
+    """Columnas numéricas que produce create_features: las únicas que puede pedir un manifest"""
+    sample = pd.DataFrame([{
+        'id_player': 0, 'team': 'Unknown', 'position': 'M', 'captain': 0, 'height': 180.0,
+        'country_': 'Unknown', 'market_value': 1e6, 'age': 25.0, 'player_last_3_avg': 45.0
+    }])
+    return create_features(sample).select_dtypes(include='number').columns.tolist()
+
+
+def build_squad_features(df):
+    """Features de todas las plantillas (por equipo: las frecuencias dependen del equipo)"""
+    return pd.concat(
+        [create_features(team_df) for _, team_df in df.groupby('team', sort=False)],
+        ignore_index=True
+    )
+
+
+def predict_squads(df, model, scaler, feature_cols=None, features=None):
+    """
+    Probabilidades y explicaciones de todas las plantillas en un solo lote.
+    El escalado, predict_proba y pred_contribs se llaman una sola vez; se
+    pueden pasar `features` ya calculadas para puntuar varios modelos.
+    """
+    scored = (features if features is not None else build_squad_features(df)).copy()
+
+    feature_cols = list(feature_cols or get_feature_columns())
+    X_scaled = scaler.transform(scored[feature_cols])
+
+    scored['probability'] = model.predict_proba(X_scaled)[:, 1]
+
+    contributions, _ = feature_contributions(model, X_scaled, feature_cols)
+    scored['explanation'] = top_contributions(contributions, feature_cols)
+
+    return pd.concat([scored, contributions], axis=1)
+
+
+def compare_model_versions(df, scorers):
+    """
+    Puntúa las mismas plantillas con varios modelos en una pasada: las
+    features se calculan una vez. `scorers` es {versión: (modelo, scaler, features)}.
+    """
+    features = build_squad_features(df)
+    comparison = features[['id_player', 'team', 'player_name', 'position']].copy()
+
+    for version, (model, scaler, feature_cols) in scorers.items():
+        feature_cols = list(feature_cols or get_feature_columns())
+        X_scaled = scaler.transform(features[feature_cols])
+        comparison[version] = model.predict_proba(X_scaled)[:, 1]
+
+    return comparison
+
+
+def select_best_11_by_formation(df, model, scaler, team):
+    team_df = df[df['team'] == team].copy()
+
+    if len(team_df) == 0:
+        return None, None
+
+    # Si el lote ya viene puntuado (predict_squads) se reutiliza
+    if 'probability' not in team_df.columns:
+        team_df = predict_squads(team_df, model, scaler)
+
+    formation = {'G': 1, 'D': 4, 'M': 3, 'F': 3}
+    lineup = {}
+    starters_ids = []
+
+    for position, num_players in formation.items():
+        position_players = team_df[team_df['position'] == position].copy()
+
+        if len(position_players) == 0:
+            lineup[position] = []
+            continue
+
+        position_players = position_players.sort_values('probability', ascending=False)
+        best_players = position_players.head(num_players)
+        best_players['rank'] = range(1, len(best_players) + 1)
+
+        starters_ids.extend(best_players['id_player'].tolist())
+
+        lineup[position] = best_players[[
+            'id_player', 'position', 'player_name', 'shirt_number',
+            'probability', 'captain', 'explanation'
+        ]].to_dict('records')
+
+    bench_df = team_df[~team_df['id_player'].isin(starters_ids)].copy()
+    bench_df = bench_df.sort_values('probability', ascending=False)
+    bench_df['bench_rank'] = range(1, len(bench_df) + 1)
+
+    bench_players = bench_df[[
+        'id_player', 'player_name', 'shirt_number', 'position', 
+        'probability', 'bench_rank', 'explanation'
+    ]].to_dict('records')
+
+    return lineup, bench_players
+
+
+def fit_imputer(history_index):
+    """Medianas por equipo/posición/nivel de mercado, ajustadas sobre el último estado de cada jugador"""
+    players = history_index.df.groupby('id_player', sort=False).tail(1).set_index('id_player')
+    players = players.drop(columns='player_last_3_avg', errors='ignore').join(
+        calculate_temporal_features_from_history(history_index).set_index('id_player')
+    )
+    return Imputer.fit(players)
+
+
+def squad_frame(df_convocatoria, history_index, imputer, df_jugadores=None):
+    """Convocatoria con player_last_3_avg, nombre y dorsal de cada jugador y los huecos imputados"""
+    df_features_temporales = calculate_temporal_features_from_history(history_index)
+
+    df_final = df_convocatoria.merge(
+        df_features_temporales[['id_player', 'player_last_3_avg']],
+        on='id_player',
+        how='left'
+    )
+
+    if df_jugadores is not None:
+        df_final = df_final.merge(
+            df_jugadores[['id_player', 'player_name', 'shirt_number']],
+            on='id_player',
+            how='left'
+        )
+        df_final['player_name'] = df_final['player_name'].fillna(
+            'Jugador ' + df_final['id_player'].astype(str)
+        )
+        df_final['shirt_number'] = df_final['shirt_number'].fillna(0).astype(int)
+    else:
+        df_final['player_name'] = 'Jugador ' + df_final['id_player'].astype(str)
+        df_final['shirt_number'] = 0
+
+    # Jugadores sin histórico o con datos incompletos: medianas condicionadas, no constantes
+    return imputer.transform(df_final)
@@ -0,0 +1,158 @@
+"""
+Histórico persistente de predicciones en SQLite.
+
+Cada ejecución de scoring (todos los equipos) se guarda una vez por
+(día, versión de modelo, versión de datos): repetir esa combinación no
+añade nada, aunque las filas hayan cambiado (UNIQUE en runs). Dentro de una
+ejecución cada jugador aparece una sola vez. Los índices por equipo, jugador
+y fecha permiten consultar la evolución de un jugador en la temporada o
+comparar el XI previsto con el real en milisegundos.
+"""
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    UNIQUE (run_date, model_version, data_version)
+);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    run_date TEXT NOT NULL,
+    team TEXT NOT NULL,
+    id_player INTEGER NOT NULL,
+    player_name TEXT,
+    position TEXT,
+    probability REAL NOT NULL,
+    is_starter INTEGER NOT NULL,
+    bench_rank INTEGER,
+    match_id TEXT,
+    PRIMARY KEY (run_id, id_player)
+);
+
+CREATE INDEX IF NOT EXISTS idx_predictions_team_date ON predictions (team, run_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_player_date ON predictions (id_player, run_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions (run_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_match ON predictions (match_id, team);
+"""
+
+
+def lineup_rows(team, lineup, bench_players, match_id=None):
+    """Aplana la salida de select_best_11_by_formation a filas de la tabla predictions"""
+    rows = []
+    for players in lineup.values():
+        for player in players:
+            rows.append((team, player['id_player'], player.get('player_name'), player['position'],
+                         player['probability'], 1, None, match_id))
+    for player in bench_players:
+        rows.append((team, player['id_player'], player.get('player_name'), player['position'],
+                     player['probability'], 0, player['bench_rank'], match_id))
+    return rows
+
+
+class PredictionStore:
+    """Almacén embebido de predicciones (una conexión compartida por proceso)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def record_run(self, rows, model_version, data_version, run_date=None):
+        """
+        Guarda una ejecución completa. Devuelve su run_id, o None si esa
+        combinación (día, modelo, datos) ya estaba registrada: las ejecuciones
+        se deduplican por esa clave, no por su contenido.
+        Si un jugador llega repetido se guarda su primera fila.
+        """
+        run_date = (run_date or date.today()).isoformat()
+        unique_rows = {}
+        for row in rows:
+            unique_rows.setdefault(int(row[1]), row)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO runs (run_date, created_at, model_version, data_version) VALUES (?, ?, ?, ?)',
+                (run_date, datetime.now().isoformat(timespec='seconds'), model_version, data_version)
+            )
+            if cursor.rowcount == 0:
+                return None
+
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                'INSERT INTO predictions (run_id, run_date, team, id_player, player_name, position, '
+                'probability, is_starter, bench_rank, match_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, run_date, team, int(id_player), name, position, float(probability),
+                  is_starter, None if bench_rank is None else int(bench_rank), match_id)
+                 for team, id_player, name, position, probability, is_starter, bench_rank, match_id
+                 in unique_rows.values()]
+            )
+            return run_id
+
+    def _query(self, sql, params):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def player_trend(self, id_player, start_date=None, end_date=None, model_version=None):
+        """Probabilidad de titularidad de un jugador por ejecución, en orden cronológico"""
+        sql = (
+            'SELECT p.run_date, r.model_version, p.team, p.probability, p.is_starter, p.bench_rank '
+            'FROM predictions p JOIN runs r USING (run_id) '
+            'WHERE p.id_player = ? AND p.run_date BETWEEN ? AND ?'
+        )
+        params = [int(id_player), str(start_date or '0000-01-01'), str(end_date or '9999-12-31')]
+        if model_version is not None:
+            sql += ' AND r.model_version = ?'
+            params.append(model_version)
+        return self._query(sql + ' ORDER BY p.run_date, p.run_id', params)
+
+    def team_predictions(self, team, start_date=None, end_date=None):
+        """Todas las predicciones de un equipo en un rango de fechas"""
+        return self._query(
+            'SELECT * FROM predictions WHERE team = ? AND run_date BETWEEN ? AND ? '
+            'ORDER BY run_date, run_id, is_starter DESC, probability DESC',
+            [team, str(start_date or '0000-01-01'), str(end_date or '9999-12-31')]
+        )
+
+    def predicted_starters(self, match_id, team, match_date=None):
+        """
+        XI previsto para `match_id` en la última ejecución hecha hasta el día del
+        partido (`match_date`); sin fecha, en la última ejecución para ese partido.
+        """
+        last_day = '9999-12-31' if pd.isna(match_date) else str(pd.Timestamp(match_date).date())
+        return self._query(
+            'SELECT id_player, player_name, position, probability FROM predictions '
+            'WHERE match_id = ? AND team = ? AND is_starter = 1 AND run_id = ('
+            '    SELECT MAX(run_id) FROM predictions WHERE match_id = ? AND team = ? AND run_date <= ?'
+            ')',
+            [str(match_id), team, str(match_id), team, last_day]
+        )
+
+    def predicted_matches(self, team):
+        """Partidos del equipo para los que hay alguna predicción guardada"""
+        return self._query(
+            'SELECT match_id, MAX(run_date) AS run_date FROM predictions '
+            'WHERE team = ? AND match_id IS NOT NULL GROUP BY match_id ORDER BY run_date',
+            [team]
+        )
+
+    def compare_with_actual(self, match_id, team, actual_starter_ids, match_date=None):
+        """Aciertos del XI previsto frente a los titulares reales de un partido"""
+        predicted = self.predicted_starters(match_id, team, match_date)
+        actual = set(int(player_id) for player_id in actual_starter_ids)
+        predicted['started'] = predicted['id_player'].isin(actual)
+        return {
+            'match_id': match_id,
+            'predicted': len(predicted),
+            'hits': int(predicted['started'].sum()),
+            'detail': predicted
+        }
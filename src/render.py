@@ -0,0 +1,735 @@
+"""
+Fragmentos HTML de la app (cabecera, campo 4-3-3, banca, partidos) y su CSS,
+más lo que necesitan para construirse: nombres y escudos de los equipos,
+próximo partido y resumen de resultados.
+
+La app los pinta con st.markdown y `python -m src.export` los reutiliza
+para generar páginas estáticas, así que ambas vistas son idénticas.
+"""
+import html
+
+import pandas as pd
+
+from src.badges import local_badge_url
+
+CUSTOM_CSS = """
+<style>
+.football-field {
+    background: linear-gradient(180deg, #2d5016 0%, #1a3a0f 100%);
+    border: 3px solid #ffffff;
+    border-radius: 10px;
+    padding: 40px 20px;
+    position: relative;
+    min-height: 700px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+    width: 100%;
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+.center-line {
+    position: absolute;
+    top: 50%;
+    left: 0;
+    width: 100%;
+    height: 2px;
+    background: white;
+    transform: translateY(-50%);
+    opacity: 0.3;
+}
+
+.center-circle {
+    position: absolute;
+    top: 50%;
+    left: 50%;
+    width: 120px;
+    height: 120px;
+    border: 2px solid white;
+    border-radius: 50%;
+    transform: translate(-50%, -50%);
+    opacity: 0.3;
+}
+
+.lineup-row {
+    display: flex;
+    justify-content: center;
+    align-items: center;
+    flex-wrap: wrap;
+    margin: 20px 0;
+    gap: 15px;
+    position: relative;
+    z-index: 10;
+    width: 100%;
+}
+
+.player-card {
+    background: rgba(255, 255, 255, 0.95);
+    border: 2px solid #1a3a0f;
+    border-radius: 10px;
+    padding: 12px 16px;
+    text-align: center;
+    width: 140px;
+    flex-shrink: 0;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.2);
+    transition: all 0.3s ease;
+}
+
+.player-card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 8px 12px rgba(0,0,0,0.3);
+}
+
+.player-number {
+    font-weight: 900;
+    font-size: 28px;
+    color: #1a3a0f;
+    margin-bottom: 6px;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
+}
+
+.player-name {
+    font-weight: 600;
+    font-size: 11px;
+    color: #1a3a0f;
+    margin-bottom: 4px;
+    text-transform: uppercase;
+    letter-spacing: 0.3px;
+    word-wrap: break-word;
+    line-height: 1.2;
+}
+
+.player-position-badge {
+    font-size: 9px;
+    color: #666;
+    font-weight: 600;
+    background: rgba(0,0,0,0.05);
+    padding: 2px 6px;
+    border-radius: 4px;
+    display: inline-block;
+    margin-top: 3px;
+}
+
+.player-explain {
+    font-size: 8px;
+    line-height: 1.3;
+    margin-top: 5px;
+    color: #444;
+}
+
+.bench-explain {
+    font-size: 10px;
+    margin-top: 2px;
+    color: #444;
+}
+
+.line-label {
+    text-align: center;
+    color: white;
+    font-weight: 700;
+    font-size: 15px;
+    margin: 15px 0 8px 0;
+    text-transform: uppercase;
+    letter-spacing: 2px;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    width: 100%;
+}
+
+.goalkeeper .player-card {
+    background: rgba(255, 215, 0, 0.95);
+    border-color: #d4af37;
+}
+
+.bench-section {
+    margin-top: 30px;
+    padding: 20px;
+    background: rgba(255, 255, 255, 0.05);
+    border-radius: 10px;
+    max-width: 1400px;
+    margin-left: auto;
+    margin-right: auto;
+}
+
+.bench-title {
+    color: white;
+    font-size: 20px;
+    font-weight: 700;
+    text-align: center;
+    margin-bottom: 15px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.bench-player {
+    display: flex;
+    align-items: center;
+    padding: 10px 15px;
+    margin: 8px 0;
+    background: rgba(255, 255, 255, 0.9);
+    border-radius: 8px;
+    transition: all 0.2s ease;
+}
+
+.bench-player:hover {
+    background: rgba(255, 255, 255, 1);
+    transform: translateX(5px);
+}
+
+.bench-player-top5 {
+    background: linear-gradient(135deg, rgba(255, 215, 0, 0.3) 0%, rgba(255, 255, 255, 0.9) 100%);
+    border-left: 4px solid #ffd700;
+    font-weight: 600;
+}
+
+.bench-number {
+    font-size: 20px;
+    font-weight: 900;
+    color: #1a3a0f;
+    min-width: 40px;
+    text-align: center;
+}
+
+.bench-name {
+    flex-grow: 1;
+    font-size: 14px;
+    color: #1a3a0f;
+    margin-left: 15px;
+}
+
+.bench-position {
+    font-size: 12px;
+    color: #666;
+    font-weight: 600;
+    background: rgba(0,0,0,0.05);
+    padding: 4px 10px;
+    border-radius: 4px;
+    margin-right: 10px;
+}
+
+.bench-rank {
+    font-size: 11px;
+    color: #888;
+    min-width: 30px;
+    text-align: right;
+}
+
+.stat-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 20px;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+
+.stat-number {
+    font-size: 32px;
+    font-weight: 900;
+    margin-bottom: 5px;
+}
+
+.stat-label {
+    font-size: 14px;
+    opacity: 0.9;
+}
+
+.match-card {
+    padding: 15px;
+    margin: 10px 0;
+    border-radius: 8px;
+    background: white;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    transition: all 0.2s ease;
+}
+
+.match-card:hover {
+    box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+    transform: translateY(-2px);
+}
+
+.match-finished {
+    border-left: 4px solid #28a745;
+}
+
+.match-scheduled {
+    border-left: 4px solid #ffc107;
+}
+
+.match-postponed {
+    border-left: 4px solid #dc3545;
+}
+
+.match-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-bottom: 10px;
+}
+
+.match-date {
+    font-size: 13px;
+    color: #666;
+    font-weight: 600;
+}
+
+.match-status {
+    font-size: 11px;
+    padding: 3px 8px;
+    border-radius: 4px;
+    font-weight: 600;
+}
+
+.status-finished {
+    background: #28a745;
+    color: white;
+}
+
+.status-scheduled {
+    background: #ffc107;
+    color: #000;
+}
+
+.status-postponed {
+    background: #dc3545;
+    color: white;
+}
+
+.match-teams {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 10px 0;
+}
+
+.team-home, .team-away {
+    flex: 1;
+    font-size: 15px;
+    font-weight: 600;
+    color: #1a3a0f;
+}
+
+.team-away {
+    text-align: right;
+}
+
+.match-score {
+    font-size: 24px;
+    font-weight: 900;
+    color: #1a3a0f;
+    min-width: 80px;
+    text-align: center;
+}
+
+.match-vs {
+    font-size: 16px;
+    color: #999;
+    font-weight: 600;
+    min-width: 80px;
+    text-align: center;
+}
+</style>
+"""
+
+# Solo para las páginas estáticas: fondo y tipografía del tema oscuro de Streamlit
+PAGE_CSS = """
+<style>
+body {
+    background: #0e1117;
+    color: #fafafa;
+    font-family: "Source Sans Pro", sans-serif;
+    max-width: 1100px;
+    margin: 0 auto;
+    padding: 20px;
+}
+a { color: #a8ff5e; }
+h2, h3, h4 { color: white; }
+.stat-row { display: flex; gap: 10px; margin: 20px 0; }
+.stat-row .stat-card { flex: 1; }
+.match-columns { display: flex; gap: 20px; }
+.match-columns > div { flex: 1; }
+.squad-table { width: 100%; border-collapse: collapse; font-size: 14px; }
+.squad-table th, .squad-table td { padding: 6px 8px; border-bottom: 1px solid #333; text-align: left; }
+.team-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 15px; }
+.team-link { display: block; text-align: center; padding: 15px; background: rgba(255,255,255,0.05); border-radius: 10px; text-decoration: none; }
+.team-link img { width: 60px; height: 60px; display: block; margin: 0 auto 10px auto; }
+</style>
+"""
+
+POSITION_LABELS = {'G': 'POR', 'D': 'DEF', 'M': 'MED', 'F': 'DEL'}
+
+
+def team_header_html(team_name, next_match_info=None, show_formation=True, badge_url=None):
+    """Header con escudo, nombre y próximo partido - TODO CENTRADO"""
+    header_html = '<div style="text-align: center; padding: 20px 0; margin-bottom: 20px;">'
+
+    # Escudo centrado
+    if badge_url:
+        header_html += f'<img src="{badge_url}" style="width: 100px; display: block; margin: 0 auto 15px auto;" />'
+
+    # Nombre del equipo
+    header_html += f'<h1 style="color: white; margin: 10px 0 5px 0; font-size: 36px;">{team_name}</h1>'
+
+    # Formación (solo si show_formation=True)
+    if show_formation:
+        header_html += '<p style="color: #ffd700; font-size: 18px; font-weight: 600; margin: 5px 0;">Formación: 4-3-3</p>'
+
+    # Próximo partido
+    if next_match_info:
+        match_text = f"📅 Próximo: {next_match_info['date']} vs {next_match_info['opponent']} ({next_match_info['location']})"
+        header_html += f'<p style="color: white; background: rgba(0,0,0,0.3); padding: 8px 15px; border-radius: 8px; margin: 10px auto 0 auto; font-size: 14px; display: inline-block;">{match_text}</p>'
+
+    header_html += '</div>'
+    return header_html
+
+
+def format_explanation(player, css_class='player-explain'):
+    """Desglose compacto de las features que más empujan la predicción del jugador"""
+    explanation = player.get('explanation')
+    if not explanation:
+        return ''
+
+    parts = []
+    for label, value in explanation:
+        arrow = '▲' if value >= 0 else '▼'
+        color = '#28a745' if value >= 0 else '#dc3545'
+        parts.append(f'<span style="color: {color};">{arrow} {label} {value:+.2f}</span>')
+
+    return f'<div class="{css_class}">' + ' · '.join(parts) + '</div>'
+
+
+def formation_html(lineup):
+    """Campo con el XI en 4-3-3"""
+    field_html = '<div class="football-field">'
+    field_html += '<div class="center-line"></div>'
+    field_html += '<div class="center-circle"></div>'
+
+    # DELANTEROS
+    field_html += '<div class="line-label">⚡ DELANTEROS</div>'
+    forwards = lineup.get('F', [])
+    if forwards:
+        field_html += '<div class="lineup-row">'
+        for player in forwards:
+            name = player.get('player_name', f"Jugador {player['id_player']}")
+            number = player.get('shirt_number', '?')
+            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">DEL</div>{format_explanation(player)}</div>'
+        field_html += '</div>'
+
+    # MEDIOCAMPISTAS
+    field_html += '<div class="line-label">⚙️ MEDIOCAMPISTAS</div>'
+    midfielders = lineup.get('M', [])
+    if midfielders:
+        field_html += '<div class="lineup-row">'
+        for player in midfielders:
+            name = player.get('player_name', f"Jugador {player['id_player']}")
+            number = player.get('shirt_number', '?')
+            captain = ' (C)' if player.get('captain', 0) == 1 else ''
+            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}{captain}</div><div class="player-position-badge">MED</div>{format_explanation(player)}</div>'
+        field_html += '</div>'
+
+    # DEFENSAS
+    field_html += '<div class="line-label">🛡️ DEFENSAS</div>'
+    defenders = lineup.get('D', [])
+    if defenders:
+        field_html += '<div class="lineup-row">'
+        for player in defenders:
+            name = player.get('player_name', f"Jugador {player['id_player']}")
+            number = player.get('shirt_number', '?')
+            field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">DEF</div>{format_explanation(player)}</div>'
+        field_html += '</div>'
+
+    # PORTERO
+    field_html += '<div class="line-label">🧤 PORTERO</div>'
+    goalkeeper = lineup.get('G', [])
+    if goalkeeper:
+        gk = goalkeeper[0]
+        name = gk.get('player_name', f"Jugador {gk['id_player']}")
+        number = gk.get('shirt_number', '?')
+        field_html += '<div class="lineup-row goalkeeper">'
+        field_html += f'<div class="player-card"><div class="player-number">{number}</div><div class="player-name">{name}</div><div class="player-position-badge">POR</div>{format_explanation(gk)}</div>'
+        field_html += '</div>'
+
+    field_html += '</div>'
+    return field_html
+
+
+def bench_html(bench_players):
+    """Suplentes ordenados por probabilidad (los 5 primeros resaltados)"""
+    bench_html = '<div class="bench-section">'
+    bench_html += '<div class="bench-title">JUGADORES EN BANCA</div>'
+
+    for player in bench_players:
+        number = player.get('shirt_number', '?')
+        name = player.get('player_name', f"Jugador {player['id_player']}")
+        position = player.get('position', '?')
+        rank = player.get('bench_rank', 0)
+
+        css_class = 'bench-player bench-player-top5' if rank <= 5 else 'bench-player'
+        explanation = format_explanation(player, css_class='bench-explain')
+        pos_label = POSITION_LABELS.get(position, position)
+
+        bench_html += f'<div class="{css_class}"><div class="bench-number">{number}</div><div class="bench-name">{name}{explanation}</div><div class="bench-position">{pos_label}</div><div class="bench-rank">#{rank}</div></div>'
+
+    bench_html += '</div>'
+    return bench_html
+
+
+def record_cards_html(played, wins, draws, losses, goals_for, goals_against):
+    """Tarjetas de balance del equipo (una por estadística)"""
+    return [
+        f'<div class="stat-card"><div class="stat-number">{played}</div><div class="stat-label">Jugados</div></div>',
+        f'<div class="stat-card" style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%);"><div class="stat-number">{wins}</div><div class="stat-label">Ganados</div></div>',
+        f'<div class="stat-card" style="background: linear-gradient(135deg, #ffc107 0%, #ffb300 100%);"><div class="stat-number">{draws}</div><div class="stat-label">Empates</div></div>',
+        f'<div class="stat-card" style="background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);"><div class="stat-number">{losses}</div><div class="stat-label">Perdidos</div></div>',
+        f'<div class="stat-card" style="background: linear-gradient(135deg, #17a2b8 0%, #138496 100%);"><div class="stat-number">{int(goals_for)}</div><div class="stat-label">GF</div></div>',
+        f'<div class="stat-card" style="background: linear-gradient(135deg, #6c757d 0%, #5a6268 100%);"><div class="stat-number">{int(goals_against)}</div><div class="stat-label">GC</div></div>'
+    ]
+
+
+def result_card_html(team_name, opponent, is_home, date_str, team_score, opp_score):
+    """Tarjeta de un partido jugado"""
+    location = 'Local' if is_home else 'Visitante'
+
+    if team_score > opp_score:
+        status_class = 'status-finished'
+        status_text = 'VICTORIA'
+    elif team_score == opp_score:
+        status_class = 'status-scheduled'
+        status_text = 'EMPATE'
+    else:
+        status_class = 'status-postponed'
+        status_text = 'DERROTA'
+
+    return f'''
+    <div class="match-card match-finished">
+        <div class="match-header">
+            <div class="match-date">📅 {date_str} • {location}</div>
+            <div class="match-status {status_class}">{status_text}</div>
+        </div>
+        <div class="match-teams">
+            <div class="team-home">{team_name if is_home else opponent}</div>
+            <div class="match-score">{team_score} - {opp_score}</div>
+            <div class="team-away">{opponent if is_home else team_name}</div>
+        </div>
+    </div>
+    '''
+
+
+def fixture_card_html(team_name, opponent, is_home, date_str, status):
+    """Tarjeta de un partido por jugar"""
+    location = 'Local' if is_home else 'Visitante'
+
+    if status == 'POSTPONED':
+        match_class = 'match-postponed'
+        status_class = 'status-postponed'
+        status_text = 'POSPUESTO'
+    else:
+        match_class = 'match-scheduled'
+        status_class = 'status-scheduled'
+        status_text = 'PROGRAMADO'
+
+    return f'''
+    <div class="match-card {match_class}">
+        <div class="match-header">
+            <div class="match-date">📅 {date_str} • {location}</div>
+            <div class="match-status {status_class}">{status_text}</div>
+        </div>
+        <div class="match-teams">
+            <div class="team-home">{team_name if is_home else opponent}</div>
+            <div class="match-vs">vs</div>
+            <div class="team-away">{opponent if is_home else team_name}</div>
+        </div>
+    </div>
+    '''
+
+
+def page_html(title, body):
+    """Documento HTML autocontenido (CSS de la app incluido)"""
+    return (
+        '<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{html.escape(title)}</title>\n{CUSTOM_CSS}{PAGE_CSS}</head>\n<body>\n{body}\n</body>\n</html>\n'
+    )
+
+
+def team_badge_url(team_name, badges=None, manifest=None, prefix=''):
+    """Escudo del equipo: el de la partición o el local (`manifest` de src/badges.py); None si no hay"""
+    if badges and team_name in badges:
+        return badges[team_name]
+
+    return local_badge_url(manifest or {}, normalize_team_name(team_name), prefix)
+
+
+# Variantes de nombre (API de partidos, abreviaturas) -> nombre canónico de los CSV
+TEAM_NAME_ALIASES = {
+    'Arsenal FC': 'Arsenal',
+    'Aston Villa FC': 'Aston Villa',
+    'AFC Bournemouth': 'Bournemouth',
+    'Brentford FC': 'Brentford',
+    'Brighton & Hove Albion FC': 'Brighton & Hove Albion',
+    'Brighton': 'Brighton & Hove Albion',
+    'Burnley FC': 'Burnley',
+    'Chelsea FC': 'Chelsea',
+    'Crystal Palace FC': 'Crystal Palace',
+    'Everton FC': 'Everton',
+    'Fulham FC': 'Fulham',
+    'Leeds United FC': 'Leeds United',
+    'Liverpool FC': 'Liverpool',
+    'Manchester City FC': 'Manchester City',
+    'Manchester United FC': 'Manchester United',
+    'Manchester Utd': 'Manchester United',
+    'Newcastle United FC': 'Newcastle United',
+    'Nottingham Forest FC': 'Nottingham Forest',
+    'Sunderland AFC': 'Sunderland',
+    'Tottenham Hotspur FC': 'Tottenham Hotspur',
+    'West Ham United FC': 'West Ham United',
+    'Wolverhampton Wanderers FC': 'Wolverhampton',
+    'Wolves': 'Wolverhampton'
+}
+
+
+def team_name_variations(team_name, aliases=None):
+    """Nombre canónico y todas las variantes que normalize_team_name lleva a él"""
+    # Mismo orden de preferencia que normalize_team_name: los alias de la partición mandan
+    known = {**TEAM_NAME_ALIASES, **(aliases or {})}
+    return [team_name] + [alias for alias, canonical in known.items() if canonical == team_name and alias != team_name]
+
+
+def normalize_team_name(name, aliases=None):
+    """Normaliza los nombres de equipos para coincidir entre datasets"""
+    # Alias propios de la partición (otras ligas/temporadas) antes que los de la Premier
+    if aliases and name in aliases:
+        return aliases[name]
+
+    return TEAM_NAME_ALIASES.get(name, name)
+
+
+def get_next_match(df_matches, team_name, aliases=None):
+    """Obtiene el próximo partido del equipo"""
+    if df_matches is None or len(df_matches) == 0:
+        return None
+
+    team_variations = team_name_variations(team_name, aliases)
+
+    team_matches = df_matches[
+        (df_matches['home_team_name'].isin(team_variations)) | 
+        (df_matches['away_team_name'].isin(team_variations))
+    ].copy()
+
+    if len(team_matches) == 0:
+        return None
+
+    team_matches['utcDate'] = pd.to_datetime(team_matches['utcDate'])
+
+    scheduled = team_matches[team_matches['status'].isin(['TIMED', 'POSTPONED'])].copy()
+
+    if len(scheduled) == 0:
+        return None
+
+    scheduled = scheduled.sort_values('utcDate')
+    next_match = scheduled.iloc[0]
+
+    is_home = next_match['home_team_name'] in team_variations
+    opponent = next_match['away_team_name'] if is_home else next_match['home_team_name']
+    opponent = normalize_team_name(opponent, aliases)
+
+    location = 'Local' if is_home else 'Visitante'
+    date_str = next_match['utcDate'].strftime('%d/%m/%Y')
+
+    return {
+        'opponent': opponent,
+        'location': location,
+        'date': date_str,
+        'is_home': is_home
+    }
+
+
+# Columnas de las tablas de plantilla (sin formatear fila a fila)
+SQUAD_TABLE_COLUMNS = [
+    'player_name', 'position_label', 'age', 'matchs',
+    'minutes_played', 'minutes_per_match', 'goals', 'goals_per_match',
+    'assits', 'assists_per_match', 'goal_contributions_per_90',
+    'goal_contributions_per_90_pct_position'
+]
+
+# Etiquetas de las columnas de la plantilla (la app añade el formato de cada una)
+SQUAD_TABLE_LABELS = {
+    'player_name': 'Jugador',
+    'team': 'Equipo',
+    'position_label': 'Pos',
+    'age': 'Edad',
+    'matchs': 'PJ',
+    'minutes_played': 'Min',
+    'minutes_per_match': 'Min/PJ',
+    'goals': 'Goles',
+    'goals_per_match': 'G/PJ',
+    'assits': 'Asist',
+    'assists_per_match': 'A/PJ',
+    'goal_contributions_per_90': 'G+A/90',
+    'goal_contributions_per_90_pct_position': 'Pctl Pos'
+}
+
+
+def team_match_summary(df_matches, team_name, aliases=None):
+    """Balance y tarjetas HTML de los últimos y próximos partidos de un equipo"""
+
+    team_variations = team_name_variations(team_name, aliases)
+
+    team_matches = df_matches[
+        df_matches['home_team_name'].isin(team_variations) | 
+        df_matches['away_team_name'].isin(team_variations)
+    ].copy()
+
+    if len(team_matches) == 0:
+        return None
+
+    team_matches['utcDate'] = pd.to_datetime(team_matches['utcDate'])
+    team_matches = team_matches.sort_values('utcDate')
+
+    finished = team_matches[team_matches['status'] == 'FINISHED'].copy()
+    scheduled = team_matches[team_matches['status'].isin(['TIMED', 'POSTPONED'])].copy()
+
+    wins = 0
+    draws = 0
+    losses = 0
+    goals_for = 0
+    goals_against = 0
+
+    for _, match in finished.iterrows():
+        is_home = match['home_team_name'] in team_variations
+        team_score = match['score_home'] if is_home else match['score_away']
+        opp_score = match['score_away'] if is_home else match['score_home']
+
+        goals_for += team_score
+        goals_against += opp_score
+
+        if team_score > opp_score:
+            wins += 1
+        elif team_score == opp_score:
+            draws += 1
+        else:
+            losses += 1
+
+    results = []
+    for _, match in finished.tail(10).iloc[::-1].iterrows():
+        is_home = match['home_team_name'] in team_variations
+        team_score = int(match['score_home']) if is_home else int(match['score_away'])
+        opp_score = int(match['score_away']) if is_home else int(match['score_home'])
+        opponent = match['away_team_name'] if is_home else match['home_team_name']
+        opponent = normalize_team_name(opponent, aliases)
+
+        date_str = match['utcDate'].strftime('%d/%m/%Y')
+        results.append(result_card_html(team_name, opponent, is_home, date_str, team_score, opp_score))
+
+    fixtures = []
+    for _, match in scheduled.head(10).iterrows():
+        is_home = match['home_team_name'] in team_variations
+        opponent = match['away_team_name'] if is_home else match['home_team_name']
+        opponent = normalize_team_name(opponent, aliases)
+
+        date_str = match['utcDate'].strftime('%d/%m/%Y')
+        fixtures.append(fixture_card_html(team_name, opponent, is_home, date_str, match['status']))
+
+    return {
+        'record': record_cards_html(len(finished), wins, draws, losses, goals_for, goals_against),
+        'results': results,
+        'fixtures': fixtures
+    }
@@ -0,0 +1,197 @@
+"""
+Esquemas declarativos de los CSV de data/ y etapa de normalización/validación.
+
+Cada columna declara tipo, obligatoriedad, valor por defecto y reglas
+(valores permitidos, rango, unicidad). `validate` aplica todo columna a
+columna con operaciones vectorizadas y devuelve, junto al DataFrame
+normalizado, una tabla con las filas problemáticas en vez de ocultarlas:
+  - error: la fila no es utilizable (p. ej. sin id_player o con un id
+    repetido en una columna única) y se descarta.
+  - warning: la fila se conserva; el valor inválido, no permitido o fuera
+    de rango se vacía y toma el valor por defecto si lo hay.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TRUE_VALUES = ['1', 'true', 't', 'yes', 'si', 'sí', '1.0']
+FALSE_VALUES = ['0', 'false', 'f', 'no', '0.0', 'nan', 'none', '']
+
+ISSUE_COLUMNS = ['file', 'row', 'column', 'severity', 'issue', 'value']
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    dtype: str  # 'int', 'float', 'str', 'bool' o 'date'
+    required: bool = False  # sin valor válido la fila se descarta
+    default: object = None
+    allowed: tuple = None
+    min: float = None
+    max: float = None
+    unique: bool = False
+
+
+SCHEMAS = {
+    'convocatoria_siguiente.csv': [
+        Column('id_player', 'int', required=True, unique=True),
+        Column('team', 'str', required=True),
+        Column('position', 'str', default='M', allowed=('G', 'D', 'M', 'F')),
+        Column('captain', 'bool', default=0),
+        Column('height', 'float', min=140, max=220),
+        Column('country_', 'str', default='Unknown'),
+        # Sin valor por defecto: load_data los imputa con medianas condicionadas (src/imputation.py)
+        Column('market_value', 'float', min=0),
+        Column('age', 'float', min=14, max=50)
+    ],
+    'historico.csv': [
+        Column('id_player', 'int', required=True),
+        Column('team', 'str', required=True),
+        Column('position', 'str', default='M', allowed=('G', 'D', 'M', 'F')),
+        Column('captain', 'bool', default=0),
+        Column('height', 'float', min=140, max=220),
+        # Sin minutos = no jugó (mismo criterio que el promedio móvil)
+        Column('minutesPlayed', 'float', default=0, min=0, max=130),
+        Column('country_', 'str', default='Unknown'),
+        Column('market_value', 'float', default=0, min=0),
+        Column('age', 'float', default=25, min=14, max=50)
+    ],
+    'jugadores_info.csv': [
+        Column('id_player', 'int', required=True, unique=True),
+        Column('player_name', 'str'),
+        Column('shirt_number', 'int', default=0, min=0, max=99)
+    ],
+    'plantilla.csv': [
+        Column('player_name', 'str', required=True),
+        Column('position', 'str', allowed=('GK', 'DF', 'MF', 'FW')),
+        Column('team', 'str', required=True),
+        Column('age', 'float', min=14, max=50),
+        Column('matchs', 'int', default=0, min=0),
+        Column('minutes_played', 'int', default=0, min=0),
+        Column('goals', 'int', default=0, min=0),
+        Column('assits', 'int', default=0, min=0)
+    ],
+    'premier_matches.csv': [
+        Column('utcDate', 'date', required=True),
+        Column('status', 'str', required=True, allowed=('FINISHED', 'TIMED', 'SCHEDULED', 'POSTPONED', 'IN_PLAY', 'PAUSED', 'CANCELLED')),
+        Column('home_team_name', 'str', required=True),
+        Column('away_team_name', 'str', required=True),
+        Column('score_home', 'float', min=0),
+        Column('score_away', 'float', min=0)
+    ]
+}
+
+
+def _issues(file, mask, column, severity, issue, values):
+    """Filas de `mask` como registros de incidencias (sin bucles por fila)"""
+    rows = mask[mask].index
+    return pd.DataFrame({
+        'file': file,
+        'row': rows + 2,  # número de línea en el CSV (cabecera = 1)
+        'column': column,
+        'severity': severity,
+        'issue': issue,
+        'value': values.loc[rows].astype(str).to_numpy()
+    })
+
+
+def _coerce(raw, dtype):
+    """Convierte una columna al tipo declarado; devuelve (valores, máscara de no convertibles)"""
+    present = raw.notna()
+
+    if dtype in ('int', 'float'):
+        # Texto (object o el dtype str de pandas 3): separador de miles ("1,062") -> número
+        if not pd.api.types.is_numeric_dtype(raw):
+            raw = raw.where(~present, raw.astype(str).str.replace(',', '', regex=False).str.strip())
+        values = pd.to_numeric(raw, errors='coerce').astype(float)
+        return values, present & values.isna()
+
+    if dtype == 'bool':
+        text = raw.astype(str).str.strip().str.lower()
+        is_true = text.isin(TRUE_VALUES)
+        invalid = present & ~is_true & ~text.isin(FALSE_VALUES)
+        return is_true.astype(int), invalid
+
+    if dtype == 'date':
+        values = pd.to_datetime(raw, errors='coerce')
+        return values, present & values.isna()
+
+    values = raw.where(~present, raw.astype(str).str.strip())
+    values = values.replace('', np.nan)
+    return values, pd.Series(False, index=raw.index)
+
+
+def validate(df, file, schema=None):
+    """
+    Normaliza y valida `df` según el esquema de `file`.
+    Devuelve (DataFrame normalizado, DataFrame de incidencias).
+    """
+    schema = schema if schema is not None else SCHEMAS[file]
+    df = df.copy()
+    issues = []
+    drop = pd.Series(False, index=df.index)
+
+    for column in schema:
+        if column.name not in df.columns:
+            issues.append(pd.DataFrame([{
+                'file': file, 'row': None, 'column': column.name,
+                'severity': 'error' if column.required else 'warning',
+                'issue': 'columna ausente', 'value': ''
+            }]))
+            if column.required:
+                # Sin la columna no hay filas utilizables
+                drop[:] = True
+                continue
+            df[column.name] = column.default if column.default is not None else np.nan
+
+        raw = df[column.name]
+        values, invalid = _coerce(raw, column.dtype)
+        severity = 'error' if column.required else 'warning'
+
+        if invalid.any():
+            issues.append(_issues(file, invalid, column.name, severity, f'tipo inválido ({column.dtype})', raw))
+
+        missing = values.isna() & ~invalid
+        if column.required and missing.any():
+            issues.append(_issues(file, missing, column.name, 'error', 'valor obligatorio vacío', raw))
+
+        if column.allowed is not None:
+            not_allowed = values.notna() & ~values.isin(column.allowed)
+            if not_allowed.any():
+                issues.append(_issues(file, not_allowed, column.name, 'warning', 'valor no permitido', raw))
+                values = values.where(~not_allowed)
+
+        if column.min is not None or column.max is not None:
+            low = column.min if column.min is not None else -np.inf
+            high = column.max if column.max is not None else np.inf
+            out_of_range = values.notna() & ~values.between(low, high)
+            if out_of_range.any():
+                issues.append(_issues(file, out_of_range, column.name, severity, f'fuera de rango [{low}, {high}]', raw))
+                values = values.where(~out_of_range)
+
+        if column.unique:
+            # Se conserva la primera aparición; las repetidas se descartan
+            duplicated = values.notna() & values.duplicated(keep='first')
+            if duplicated.any():
+                issues.append(_issues(file, duplicated, column.name, 'error', 'duplicado', raw))
+                drop |= duplicated
+
+        if column.required:
+            drop |= values.isna()
+        elif column.default is not None:
+            values = values.fillna(column.default)
+
+        if column.dtype == 'int' and values.notna().all():
+            values = values.astype(np.int64)
+
+        df[column.name] = values
+
+    if drop.any():
+        df = df[~drop]
+        for column in schema:
+            if column.dtype == 'int' and column.name in df.columns and df[column.name].notna().all():
+                df[column.name] = df[column.name].astype(np.int64)
+
+    report = pd.concat(issues, ignore_index=True) if issues else pd.DataFrame(columns=ISSUE_COLUMNS)
+    return df.reset_index(drop=True), report
@@ -0,0 +1,45 @@
+"""
+Lanza la app con el arranque en caliente hecho al iniciar el proceso.
+
+Uso (mismos argumentos que `streamlit run`):
+    python -m src.serve [--server.port 8501 ...]
+
+Antes de abrir el servidor, un hilo ejecuta app.py una vez en modo "bare"
+(sin sesión) como módulo __main__, igual que lo hace Streamlit. Las
+funciones cacheadas tienen así las mismas claves que en las sesiones
+reales y el primer visitante encuentra las cachés llenas; si llega antes
+de que termine, Streamlit lo hace esperar solo por lo que falte (cada
+entrada de caché se calcula una única vez).
+"""
+import importlib.util
+import sys
+import threading
+import traceback
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / 'app.py'
+
+
+def prewarm(app_path=APP_PATH):
+    """Ejecuta el script una vez fuera de sesión para llenar las cachés del proceso"""
+    try:
+        spec = importlib.util.spec_from_file_location('__main__', app_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        # El calentamiento es opcional: la primera sesión cargará lo que falte
+        traceback.print_exc()
+
+
+def main(argv=None):
+    from streamlit.web import cli
+
+    argv = sys.argv[1:] if argv is None else argv
+    threading.Thread(target=prewarm, name='warm-start-prewarm', daemon=True).start()
+
+    sys.argv = ['streamlit', 'run', str(APP_PATH), *argv]
+    cli.main()
+
+
+if __name__ == "__main__":
+    main()
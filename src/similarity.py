@@ -0,0 +1,55 @@
+"""
+Búsqueda de reemplazos por similitud sobre los vectores de features escalados.
+
+Se construye un KDTree por posición para toda la liga y otro por
+(posición, equipo), de modo que una consulta solo recorre candidatos
+válidos: sustitutos del mismo equipo o de cualquier club. Los árboles se
+crean una vez por lote de predicciones; cada consulta es O(log n).
+"""
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+LEAGUE = None
+RESULT_COLUMNS = ['id_player', 'player_name', 'team', 'position', 'probability']
+
+
+class ReplacementIndex:
+    """Vecinos más cercanos por posición (y opcionalmente equipo) en el espacio del modelo"""
+
+    def __init__(self, players, vectors, leaf_size=16):
+        # Un id repetido se indexa una sola vez (su primera fila), como en el esquema
+        unique = ~players['id_player'].duplicated().to_numpy()
+        self.players = players.loc[unique, RESULT_COLUMNS].reset_index(drop=True)
+        self.vectors = np.ascontiguousarray(np.asarray(vectors, dtype=float)[unique])
+        self._row = {player_id: i for i, player_id in enumerate(self.players['id_player'])}
+
+        self.trees = {}
+        for position, rows in self.players.groupby('position').indices.items():
+            self.trees[(position, LEAGUE)] = (KDTree(self.vectors[rows], leaf_size=leaf_size), rows)
+        for (position, team), rows in self.players.groupby(['position', 'team']).indices.items():
+            self.trees[(position, team)] = (KDTree(self.vectors[rows], leaf_size=leaf_size), rows)
+
+    def __contains__(self, id_player):
+        return id_player in self._row
+
+    def replacements(self, id_player, k=3, team=LEAGUE, exclude=()):
+        """
+        Los `k` jugadores de la misma posición más parecidos a `id_player`
+        (de `team`, o de toda la liga), sin él mismo ni los de `exclude`.
+        """
+        row = self._row[id_player]
+        position = self.players.at[row, 'position']
+        if (position, team) not in self.trees:
+            return pd.DataFrame(columns=RESULT_COLUMNS + ['distance'])
+
+        tree, rows = self.trees[(position, team)]
+        skip = set(exclude) | {id_player}
+
+        # Se piden de más para poder descartar los excluidos sin repetir la consulta
+        n = min(k + len(skip), len(rows))
+        distances, positions = tree.query(self.vectors[row:row + 1], k=n)
+
+        result = self.players.iloc[rows[positions[0]]].assign(distance=distances[0])
+        result = result[~result['id_player'].isin(skip)]
+        return result.head(k).reset_index(drop=True)
@@ -0,0 +1,99 @@
+"""
+Cubo de analítica de plantillas precalculado para toda la liga.
+
+Se construye una vez desde plantilla.csv: ratios por partido y por 90
+minutos, percentiles en la liga y por posición, resúmenes por equipo y
+tablas top-k por equipo y por liga. La pestaña Plantilla solo lee porciones.
+"""
+import numpy as np
+import pandas as pd
+
+TOP_K = 5
+# Mínimo de minutos para entrar en las clasificaciones por 90'
+MIN_MINUTES_PER_90 = 450
+LEAGUE = '__league__'
+
+POSITION_LABELS = {'GK': '🧤 POR', 'DF': '🛡️ DEF', 'MF': '⚙️ MED', 'FW': '⚡ DEL'}
+
+RATE_COLUMNS = {
+    'goals_per_match': ('goals', 'matchs', 1),
+    'assists_per_match': ('assits', 'matchs', 1),
+    'minutes_per_match': ('minutes_played', 'matchs', 1),
+    'goals_per_90': ('goals', 'minutes_played', 90),
+    'assists_per_90': ('assits', 'minutes_played', 90),
+    'goal_contributions_per_90': ('goal_contributions', 'minutes_played', 90)
+}
+
+PERCENTILE_COLUMNS = ['minutes_played', 'goals_per_90', 'assists_per_90', 'goal_contributions_per_90']
+
+LEADERBOARDS = {
+    'goals': 'goals',
+    'assists': 'assits',
+    'minutes': 'minutes_played',
+    'goal_contributions_per_90': 'goal_contributions_per_90'
+}
+
+
+def _safe_ratio(numerator, denominator, scale):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = numerator / denominator * scale
+    return ratio.replace([np.inf, -np.inf], np.nan).fillna(0)
+
+
+def _top_k(players, metric, k, by_team):
+    """Top-k de una métrica: una ordenación estable y head(k) por grupo"""
+    ranked = players.sort_values(metric, ascending=False, kind='mergesort')
+    if by_team:
+        return {team: rows for team, rows in ranked.groupby('team', sort=False).head(k).groupby('team', sort=False)}
+    return ranked.head(k)
+
+
+class SquadCube:
+    """Ratios, percentiles y clasificaciones de todos los jugadores de la liga"""
+
+    def __init__(self, df_plantilla, top_k=TOP_K):
+        players = df_plantilla.copy()
+        players['goal_contributions'] = players['goals'] + players['assits']
+        players['position_label'] = players['position'].map(POSITION_LABELS)
+
+        for column, (numerator, denominator, scale) in RATE_COLUMNS.items():
+            players[column] = _safe_ratio(players[numerator], players[denominator], scale)
+
+        for column in PERCENTILE_COLUMNS:
+            players[f'{column}_pct_league'] = players[column].rank(pct=True) * 100
+            players[f'{column}_pct_position'] = players.groupby('position')[column].rank(pct=True) * 100
+
+        self.players = players.sort_values('minutes_played', ascending=False, kind='mergesort')
+
+        grouped = players.groupby('team')
+        self.team_summary = pd.DataFrame({
+            'players': grouped.size(),
+            'avg_age': grouped['age'].mean(),
+            'goals': grouped['goals'].sum(),
+            'assists': grouped['assits'].sum()
+        })
+
+        self._teams = {team: rows for team, rows in self.players.groupby('team', sort=False)}
+
+        # Las clasificaciones por 90' excluyen jugadores con pocos minutos
+        per_90_pool = players[players['minutes_played'] >= MIN_MINUTES_PER_90]
+
+        self.leaderboards = {}
+        for name, metric in LEADERBOARDS.items():
+            pool = per_90_pool if metric.endswith('_per_90') else players
+            self.leaderboards[(LEAGUE, name)] = _top_k(pool, metric, top_k, by_team=False)
+            for team, rows in _top_k(pool, metric, top_k, by_team=True).items():
+                self.leaderboards[(team, name)] = rows
+
+    def team_players(self, team):
+        """Jugadores del equipo ordenados por minutos"""
+        return self._teams.get(team, self.players.iloc[0:0])
+
+    def team_stats(self, team):
+        if team not in self.team_summary.index:
+            return None
+        return self.team_summary.loc[team]
+
+    def leaderboard(self, name, team=None):
+        """Top-k precalculado de un equipo, o de la liga si `team` es None"""
+        return self.leaderboards.get((team or LEAGUE, name), self.players.iloc[0:0])
@@ -0,0 +1,116 @@
+"""
+Puntuación por bloques de archivos de jugadores subidos por el usuario.
+
+create_features calcula parte de las features sobre el lote completo (valor
+de mercado medio del equipo y frecuencia de países), así que puntuar cada
+bloque por separado daría resultados distintos según dónde caiga el corte.
+El archivo se recorre dos veces con memoria acotada:
+  1. `BatchStats` acumula por equipo filas, suma de valor de mercado y
+     conteos por país (tamaño proporcional a equipos x países, no a filas).
+  2. Cada bloque pasa por validación -> features -> scaler.transform ->
+     predict_proba y se entrega en cuanto está listo.
+"""
+import pandas as pd
+
+from src.schema import SCHEMAS, validate
+
+CHUNK_ROWS = 50_000
+SCHEMA_FILE = 'convocatoria_siguiente.csv'
+# Columnas que necesita la primera pasada (las obligatorias deciden qué filas se descartan)
+STATS_COLUMNS = ('id_player', 'team', 'position', 'market_value', 'country_')
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def check_columns(source):
+    """
+    Lee solo la cabecera y lanza ValueError si faltan columnas obligatorias
+    (sin ellas el esquema descarta todas las filas). Un archivo vacío lanza
+    pandas.errors.EmptyDataError, que también es un ValueError.
+    """
+    _rewind(source)
+    header = pd.read_csv(source, nrows=0).columns
+    missing = [column.name for column in SCHEMAS[SCHEMA_FILE] if column.required and column.name not in header]
+    if missing:
+        raise ValueError(f"faltan columnas obligatorias: {', '.join(missing)}")
+
+
+def read_chunks(source, chunksize=CHUNK_ROWS, columns=None):
+    """Bloques validados (bloque, incidencias) de un CSV; `source` es una ruta o un archivo subido"""
+    _rewind(source)
+
+    schema = SCHEMAS[SCHEMA_FILE]
+    usecols = None
+    if columns is not None:
+        schema = [column for column in schema if column.name in columns]
+        usecols = lambda name: name in columns
+
+    # El índice de cada bloque continúa el anterior: las incidencias conservan su línea real
+    for chunk in pd.read_csv(source, chunksize=chunksize, usecols=usecols):
+        yield validate(chunk, SCHEMA_FILE, schema)
+
+
+class BatchStats:
+    """Estadísticas por equipo que create_features calcularía sobre el archivo completo"""
+
+    def __init__(self):
+        self.teams = None  # team -> rows, market_value_sum
+        self.countries = None  # (team, country_) -> rows
+
+    def update(self, chunk):
+        teams = chunk.groupby('team').agg(
+            rows=('market_value', 'size'), market_value_sum=('market_value', 'sum')
+        )
+        countries = chunk.groupby(['team', 'country_']).size()
+
+        if self.teams is None:
+            self.teams, self.countries = teams, countries
+        else:
+            self.teams = self.teams.add(teams, fill_value=0)
+            self.countries = self.countries.add(countries, fill_value=0)
+
+    def lookup(self, df):
+        """(media de valor del equipo, frecuencia del país, frecuencia del equipo) por fila de df"""
+        teams = self.teams.reindex(df['team'])
+        rows = teams['rows'].to_numpy()
+        team_avg = teams['market_value_sum'].to_numpy() / rows
+
+        keys = pd.MultiIndex.from_arrays([df['team'], df['country_']])
+        country_freq = self.countries.reindex(keys).to_numpy() / rows
+
+        # Como en build_squad_features, las frecuencias se miden dentro de cada equipo
+        team_freq = rows / rows
+
+        return (
+            pd.Series(team_avg, index=df.index),
+            pd.Series(country_freq, index=df.index),
+            pd.Series(team_freq, index=df.index)
+        )
+
+
+def score_chunks(source, featurize, model, scaler, feature_cols, chunksize=CHUNK_ROWS, stats_transform=None):
+    """
+    Generador de (bloque puntuado, incidencias). `featurize(chunk, stats)`
+    devuelve las features del bloque con las estadísticas del archivo;
+    `stats_transform(chunk)` prepara cada bloque de la primera pasada igual
+    que lo hará featurize (p. ej. imputar market_value).
+    Comprueba las columnas obligatorias antes de la primera pasada (ValueError).
+    """
+    check_columns(source)
+
+    stats = BatchStats()
+    for chunk, _ in read_chunks(source, chunksize, columns=STATS_COLUMNS):
+        stats.update(stats_transform(chunk) if stats_transform is not None else chunk)
+
+    feature_cols = list(feature_cols)
+    for chunk, report in read_chunks(source, chunksize):
+        if chunk.empty:
+            yield chunk.assign(probability=pd.Series(dtype=float)), report
+            continue
+
+        features = featurize(chunk, stats)
+        X_scaled = scaler.transform(features[feature_cols])
+        yield chunk.assign(probability=model.predict_proba(X_scaled)[:, 1]), report
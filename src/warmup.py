@@ -0,0 +1,104 @@
+"""
+Arranque en caliente del worker: carga concurrente de datos y modelo.
+
+`python -m src.serve` lanza el calentamiento en un hilo al arrancar el
+proceso, antes de que llegue el primer visitante (ver src/serve.py).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class WarmupState:
+    """Estado del arranque compartido por todas las sesiones del proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._status = {}
+
+    def update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def mark_ready(self, **fields):
+        self.update(**fields)
+        self._ready.set()
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def status(self):
+        with self._lock:
+            return dict(self._status)
+
+
+# Streamlit re-ejecuta app.py en cada rerun, así que el estado de arranque
+# vive en este módulo (importado una sola vez por proceso).
+state = WarmupState()
+# Serializa arranques concurrentes (varias particiones o el hilo de src.serve)
+_run_lock = threading.Lock()
+
+
+def warm_start(loaders, warmup=None, initializer=None, max_workers=None):
+    """
+    Ejecuta los `loaders` (nombre -> callable sin argumentos) en paralelo,
+    luego `warmup(resultados)` y marca el worker como listo.
+    Devuelve el diccionario de resultados por nombre.
+    """
+    with _run_lock:
+        start = time.perf_counter()
+        timings = {}
+
+        def timed(name, loader):
+            t0 = time.perf_counter()
+            result = loader()
+            timings[name] = time.perf_counter() - t0
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(loaders),
+            thread_name_prefix="warm-start",
+            initializer=initializer
+        ) as pool:
+            futures = {name: pool.submit(timed, name, loader) for name, loader in loaders.items()}
+            # result() relanza en este hilo cualquier excepción del loader
+            results = {name: future.result() for name, future in futures.items()}
+
+        loaded_at = time.perf_counter()
+
+        if warmup is not None:
+            warmup(results)
+
+        state.mark_ready(
+            load_seconds=timings,
+            parallel_load_seconds=loaded_at - start,
+            warmup_seconds=time.perf_counter() - loaded_at,
+            total_seconds=time.perf_counter() - start,
+            ready_at=time.time()
+        )
+
+    return results
+
+
+def annotate(**fields):
+    """Añade métricas propias al estado del arranque (p. ej. deriva de features)"""
+    state.update(**fields)
+
+
+def is_ready():
+    """Indica si el worker ya terminó el arranque en caliente"""
+    return state.is_ready()
+
+
+def wait_until_ready(timeout=None):
+    """Bloquea hasta que el worker esté listo (o hasta `timeout` segundos)"""
+    return state.wait(timeout)
+
+
+def get_status():
+    """Devuelve los tiempos del último arranque en caliente"""
+    return state.status()
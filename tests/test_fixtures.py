@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from src.fixtures import FixtureContextStore, build_fixture_context
+
+TEAMS = ['Arsenal', 'Chelsea', 'Everton', 'Fulham']
+
+
+def season_matches():
+    """Ida y vuelta entre TEAMS, una jornada por semana; las 4 últimas sin jugar"""
+    rows = []
+    day = pd.Timestamp('2025-08-16')
+    for home in TEAMS:
+        for away in TEAMS:
+            if home != away:
+                rows.append({'utcDate': day.strftime('%Y-%m-%d'), 'home_team_name': home, 'away_team_name': away})
+                day += pd.Timedelta(days=4)
+    df = pd.DataFrame(rows)
+    rng = np.random.default_rng(0)
+    df['status'] = 'FINISHED'
+    df['score_home'] = rng.integers(0, 4, len(df)).astype(float)
+    df['score_away'] = rng.integers(0, 4, len(df)).astype(float)
+    df.loc[df.index[-4:], ['status', 'score_home', 'score_away']] = ['TIMED', np.nan, np.nan]
+    return df
+
+
+def test_incremental_update_matches_full_build():
+    full = season_matches()
+    earlier = full.copy()
+    pending = earlier.index[earlier['status'] == 'FINISHED'][-3:]
+    earlier.loc[pending, ['status', 'score_home', 'score_away']] = ['TIMED', np.nan, np.nan]
+
+    store = FixtureContextStore()
+    store.update(earlier.iloc[:-1])
+    incremental = store.update(full)
+
+    expected = build_fixture_context(full)
+    pd.testing.assert_frame_equal(incremental[expected.columns], expected, check_dtype=True)
+    assert incremental.dtypes.equals(expected.dtypes)
@@ -0,0 +1,16 @@
+import pandas as pd
+
+from src.schema import validate
+
+
+def test_thousands_separator_in_str_column():
+    df = pd.DataFrame({
+        'player_name': ['A', 'B', 'C'],
+        'team': ['Arsenal', 'Arsenal', 'Chelsea'],
+        'minutes_played': pd.Series(['1,062', '90', '2,345'], dtype='str')
+    })
+
+    clean, report = validate(df, 'plantilla.csv')
+
+    assert clean['minutes_played'].tolist() == [1062, 90, 2345]
+    assert not (report['column'] == 'minutes_played').any()